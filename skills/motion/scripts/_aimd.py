@@ -0,0 +1,69 @@
+"""Adaptive (AIMD) concurrency limit for callers running requests in parallel.
+
+The limit grows additively while recent latency stays under target and is
+cut multiplicatively on a latency breach, 429, 5xx, or connection error -
+the same control law TCP uses for its congestion window.
+"""
+
+import collections
+import contextlib
+import threading
+
+
+class Controller:
+    """Gate concurrent requests behind an AIMD-adjusted limit."""
+
+    def __init__(self, initial=1.0, min_limit=1, max_limit=8, alpha=0.5, beta=0.5,
+                 target_latency=2.0, window=20):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.alpha = alpha
+        self.beta = beta
+        self.target_latency = target_latency
+        self._latencies = collections.deque(maxlen=window)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Block until a request slot is free under the current limit."""
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self):
+        """Hold one request slot for the duration of the block."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def update(self, latency, status):
+        """Feed back one completed request's latency (seconds) and HTTP status."""
+        if status == 429 or status >= 500:
+            self.on_error()
+            return
+        with self._cond:
+            self._latencies.append(latency)
+            avg = sum(self._latencies) / len(self._latencies)
+            if avg <= self.target_latency:
+                self.limit = min(self.limit + self.alpha, self.max_limit)
+            else:
+                self._decrease()
+            self._cond.notify_all()
+
+    def on_error(self):
+        """Back off after a throttle, server error, or dropped connection."""
+        with self._cond:
+            self._decrease()
+
+    def _decrease(self):
+        self.limit = max(self.limit * self.beta, self.min_limit)
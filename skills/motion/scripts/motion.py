@@ -2,19 +2,73 @@
 """Motion API CLI - Task and calendar management."""
 
 import argparse
-import json
+import collections
+import functools
 import os
 import sys
+import threading
 import time
 from pathlib import Path
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError
-from urllib.parse import urlencode
-
-BASE_URL = "https://api.usemotion.com/v1"
 
+from _aimd import Controller
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback keeps the CLI dependency-free
+    import json
+    orjson = None
+
+# http.client, urllib.parse and random are imported where used: http.client
+# alone pulls in the email package (~40 ms), wasted on -h and usage errors.
+
+API_HOST = "api.usemotion.com"
+BASE_PATH = "/v1"
+REQUEST_TIMEOUT = 30
+
+# Motion allows 12 requests/minute on individual plans; 0 disables the local window
+RATE_LIMIT_RPM = int(os.environ.get("MOTION_RATE_LIMIT_RPM", "12"))
+RATE_LIMIT_WINDOW = 60
+
+# Retry policy: exponential backoff with jitter, floored by Retry-After
+RETRY_STATUSES = {429, 502, 503}
+RETRY_BASE_DELAY = 1
+RETRY_MAX_DELAY = 60
+RETRY_JITTER = 0.5
+WRITE_METHODS = {"POST", "PATCH", "PUT"}
+
+# Reused across calls so only the first request pays the TCP + TLS handshake.
+# One connection per thread, since http.client connections are not thread-safe.
+_local = threading.local()
+
+# Adapts how many requests may be in flight when api_request is called from
+# several threads; a plain single-threaded CLI run is unaffected.
+_controller = Controller(max_limit=int(os.environ.get("MOTION_MAX_CONCURRENCY", "4")))
+
+# Last rate-limit headers seen, and send times for the sliding RPM window;
+# both are shared between threads and only touched under _rl_lock
+_rl_state = {"remaining": None, "limit": None, "reset_at": None}
+_request_times = collections.deque()
+_rl_lock = threading.Lock()
+
+# Backoff sleeps are serialized (the resend itself happens outside the lock),
+# so threads retrying together wake up staggered instead of as a herd
+_retry_lock = threading.Lock()
+
+def json_dumps(data, indent=False):
+    """Serialize to UTF-8 JSON bytes."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None).encode()
+
+def json_loads(raw):
+    """Parse JSON from bytes."""
+    if orjson:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+@functools.lru_cache(maxsize=1)
 def get_api_key():
-    """Load API key from config file or environment."""
+    """Load API key from config file or environment (read once per process)."""
     # Check environment first
     if key := os.environ.get("MOTION_API_KEY"):
         return key
@@ -29,52 +83,197 @@ def get_api_key():
     print("Error: No API key found. Set MOTION_API_KEY or create ~/.config/motion/credentials", file=sys.stderr)
     sys.exit(1)
 
-def api_request(method, endpoint, data=None, params=None, max_retries=3):
-    """Make API request with retry logic for rate limits."""
-    api_key = get_api_key()
-    url = f"{BASE_URL}{endpoint}"
+@functools.lru_cache(maxsize=1)
+def get_headers():
+    """Headers shared by every request."""
+    return {
+        "X-API-Key": get_api_key(),
+        "Content-Type": "application/json",
+    }
+
+def _get_conn():
+    """Return this thread's keep-alive connection to the Motion API."""
+    import http.client
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = http.client.HTTPSConnection(API_HOST, timeout=REQUEST_TIMEOUT)
+    return conn
+
+def _reset_conn():
+    """Drop this thread's connection so the next request reconnects."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+    _local.conn = None
+
+def _read_body(resp):
+    """Read the whole response body.
+
+    With a Content-Length, read straight into one presized buffer; the
+    bytearray is handed to the JSON parser as-is, without a bytes copy.
+    """
+    length = int(resp.getheader("Content-Length") or 0)
+    if not length or resp.chunked:
+        return resp.read()
+    buf = bytearray(length)
+    view = memoryview(buf)
+    n = 0
+    while n < len(buf):
+        got = resp.readinto(view[n:])
+        if not got:
+            break
+        n += got
+    view.release()
+    return buf if n == len(buf) else buf[:n]
+
+def _send(method, path, body, headers):
+    """Send a request over the shared connection and read the full response.
+
+    The body must be read before the connection can be reused. If the server
+    closed an idle keep-alive connection, reconnect and try once more.
+    """
+    import http.client
+    for attempt in range(2):
+        conn = _get_conn()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            return resp, _read_body(resp)
+        except (http.client.BadStatusLine, ConnectionError):
+            _reset_conn()
+            if attempt:
+                raise
+        except BaseException:
+            # Never reuse a connection left mid-request
+            _reset_conn()
+            raise
+
+def _update_rate_limit(resp):
+    """Record rate-limit headers from a response, if the server sent any."""
+    remaining = resp.headers.get("X-RateLimit-Remaining")
+    if remaining is None:
+        return
+    limit = resp.headers.get("X-RateLimit-Limit")
+    reset = resp.headers.get("X-RateLimit-Reset")
+    reset_at = None
+    if reset:
+        reset = float(reset)
+        # Accept either an epoch timestamp or seconds until reset
+        delta = reset - time.time() if reset > 1e9 else reset
+        reset_at = time.monotonic() + max(delta, 0)
+    with _rl_lock:
+        _rl_state["remaining"] = int(remaining)
+        _rl_state["limit"] = int(limit) if limit else None
+        _rl_state["reset_at"] = reset_at
+
+def _wait_if_throttled():
+    """Sleep before sending if the rate-limit budget is nearly spent.
+
+    The budget is checked and a send slot claimed under _rl_lock, so
+    concurrent callers can't all see room in the window and overshoot it;
+    the lock is released while sleeping.
+    """
+    with _rl_lock:
+        remaining, limit, reset_at = _rl_state["remaining"], _rl_state["limit"], _rl_state["reset_at"]
+    if remaining is not None and reset_at is not None:
+        floor = max(2, (limit or 0) // 10)
+        delay = reset_at - time.monotonic()
+        if remaining <= floor and delay > 0:
+            print(f"Approaching rate limit. Pausing {delay:.0f}s...", file=sys.stderr)
+            time.sleep(delay)
+            with _rl_lock:
+                # Keep headers another thread recorded while we slept
+                if _rl_state["reset_at"] == reset_at:
+                    _rl_state["remaining"] = None
+    
+    if RATE_LIMIT_RPM > 0:
+        while True:
+            with _rl_lock:
+                now = time.monotonic()
+                while _request_times and now - _request_times[0] >= RATE_LIMIT_WINDOW:
+                    _request_times.popleft()
+                if len(_request_times) < RATE_LIMIT_RPM:
+                    _request_times.append(now)
+                    return
+                delay = RATE_LIMIT_WINDOW - (now - _request_times[0])
+            print(f"Rate limit window full. Pausing {delay:.0f}s...", file=sys.stderr)
+            time.sleep(delay)
+
+def _backoff(attempt, reason, retry_after=None):
+    """Sleep before retry `attempt`, honouring Retry-After as a lower bound."""
+    import random
+    try:
+        floor = float(retry_after) if retry_after else 0
+    except ValueError:
+        floor = 0
+    delay = min(max(floor, RETRY_BASE_DELAY * 2 ** attempt), RETRY_MAX_DELAY)
+    delay += random.uniform(0, RETRY_JITTER)
+    with _retry_lock:
+        print(f"{reason}. Retrying in {delay:.1f}s...", file=sys.stderr)
+        time.sleep(delay)
+
+def api_request(method, endpoint, data=None, params=None, max_retries=3, idempotency_key=None):
+    """Make API request with retry logic for rate limits.
+
+    Writes carry an Idempotency-Key (generated unless one is passed) that
+    stays the same across retries, so a retried write is not applied twice.
+    """
+    import http.client
+    path = f"{BASE_PATH}{endpoint}"
     
     if params:
-        # Filter None values
-        params = {k: v for k, v in params.items() if v is not None}
+        # Filter None values; urlencode takes (key, value) pairs directly
+        params = [(k, v) for k, v in params.items() if v is not None]
         if params:
-            url += "?" + urlencode(params)
-    
-    headers = {
-        "X-API-Key": api_key,
-        "Content-Type": "application/json",
-    }
+            from urllib.parse import urlencode
+            path += "?" + urlencode(params)
     
-    body = json.dumps(data).encode() if data else None
+    headers = get_headers()
+    if method in WRITE_METHODS and (data is not None or idempotency_key):
+        if not idempotency_key:
+            import uuid
+            idempotency_key = uuid.uuid4().hex
+        headers = {**headers, "Idempotency-Key": idempotency_key}
+    body = json_dumps(data) if data else None
     
     for attempt in range(max_retries):
+        last_attempt = attempt == max_retries - 1
+        _wait_if_throttled()
         try:
-            req = Request(url, data=body, headers=headers, method=method)
-            with urlopen(req) as resp:
-                if resp.status == 204:
-                    return None
-                return json.loads(resp.read().decode())
-        except HTTPError as e:
-            if e.code == 429:
-                # Rate limited - get retry-after header
-                retry_after = int(e.headers.get("Retry-After", 60))
-                if attempt < max_retries - 1:
-                    print(f"Rate limited. Retrying in {retry_after}s...", file=sys.stderr)
-                    time.sleep(retry_after)
-                    continue
-            error_body = e.read().decode() if e.fp else str(e)
-            print(f"API Error {e.code}: {error_body}", file=sys.stderr)
+            with _controller.slot():
+                started = time.monotonic()
+                resp, raw = _send(method, path, body, headers)
+            _controller.update(time.monotonic() - started, resp.status)
+        except (OSError, http.client.HTTPException) as e:
+            _controller.on_error()
+            if not last_attempt:
+                _backoff(attempt, f"Connection error ({e})")
+                continue
+            print(f"Connection error: {e}", file=sys.stderr)
             sys.exit(1)
+        _update_rate_limit(resp)
+        if resp.status == 204:
+            return None
+        if resp.status < 400:
+            return json_loads(raw) if raw else None
+        if resp.status in RETRY_STATUSES and not last_attempt:
+            reason = "Rate limited" if resp.status == 429 else f"Server error {resp.status}"
+            _backoff(attempt, reason, resp.headers.get("Retry-After"))
+            continue
+        error_body = raw.decode(errors="replace") or resp.reason
+        print(f"API Error {resp.status}: {error_body}", file=sys.stderr)
+        sys.exit(1)
     
     print("Max retries exceeded", file=sys.stderr)
     sys.exit(1)
 
 def format_output(data, format_type="json"):
-    """Format output for display."""
+    """Format output for display (pretty-printed only on a terminal)."""
     if data is None:
         return
     if format_type == "json":
-        print(json.dumps(data, indent=2))
+        sys.stdout.buffer.write(json_dumps(data, indent=sys.stdout.isatty()))
+        sys.stdout.buffer.write(b"\n")
     else:
         print(data)
 
@@ -290,26 +489,65 @@ def cmd_comment(args):
     result = api_request("POST", "/comments", data=data)
     format_output(result)
 
-def main():
-    parser = argparse.ArgumentParser(description="Motion API CLI")
-    subparsers = parser.add_subparsers(dest="command", required=True)
-    
-    # tasks
-    p = subparsers.add_parser("tasks", help="List tasks")
+def cmd_batch(args):
+    """Run newline-delimited commands in one process, sharing the connection."""
+    import shlex
+    parser = build_parser()
+    try:
+        source = sys.stdin if args.file == "-" else open(args.file)
+    except OSError as e:
+        print(f"batch: cannot read {args.file}: {e.strerror}", file=sys.stderr)
+        sys.exit(1)
+    failures = 0
+    with source:
+        for lineno, line in enumerate(source, 1):
+            try:
+                tokens = shlex.split(line, comments=True)
+            except ValueError as e:
+                # e.g. an unbalanced quote; report it like any other failing line
+                print(f"batch:{lineno}: {e}", file=sys.stderr)
+                failures += 1
+                continue
+            if not tokens:
+                continue
+            if tokens[0] == "batch":
+                print(f"batch:{lineno}: nested batch not allowed", file=sys.stderr)
+                failures += 1
+                continue
+            try:
+                sub_args = parser.parse_args(tokens)
+                sub_args.func(sub_args)
+            except SystemExit as e:
+                if e.code:
+                    print(f"batch:{lineno}: '{line.strip()}' failed", file=sys.stderr)
+                    failures += 1
+            except Exception as e:
+                print(f"batch:{lineno}: {e}", file=sys.stderr)
+                failures += 1
+            # Commands mix print() and raw stdout.buffer writes; keep them ordered
+            sys.stdout.flush()
+    if failures:
+        sys.exit(1)
+
+# ============ CLI ============
+
+def _task_id_args(p):
+    p.add_argument("task_id", help="Task ID")
+
+def _workspace_args(p):
+    p.add_argument("--workspace", "-w", help="Workspace ID")
+
+def _no_args(p):
+    pass
+
+def _tasks_args(p):
     p.add_argument("--workspace", "-w", help="Workspace ID")
     p.add_argument("--project", "-p", help="Project ID")
     p.add_argument("--status", "-s", help="Status filter")
     p.add_argument("--assignee", "-a", help="Assignee ID")
     p.add_argument("--label", "-l", help="Label filter")
-    p.set_defaults(func=cmd_tasks)
-    
-    # task
-    p = subparsers.add_parser("task", help="Get a task")
-    p.add_argument("task_id", help="Task ID")
-    p.set_defaults(func=cmd_task)
-    
-    # create
-    p = subparsers.add_parser("create", help="Create a task")
+
+def _create_args(p):
     p.add_argument("name", help="Task name")
     p.add_argument("--due", "-d", help="Due date (ISO 8601)")
     p.add_argument("--duration", help="Duration in minutes, NONE, or REMINDER")
@@ -322,10 +560,8 @@ def main():
     p.add_argument("--deadline", choices=["hard", "soft", "none"], help="Deadline type")
     p.add_argument("--start-on", help="Start date (YYYY-MM-DD)")
     p.add_argument("--auto-schedule", action="store_true", help="Enable auto-scheduling")
-    p.set_defaults(func=cmd_create)
-    
-    # update
-    p = subparsers.add_parser("update", help="Update a task")
+
+def _update_args(p):
     p.add_argument("task_id", help="Task ID")
     p.add_argument("--name", "-n", help="New name")
     p.add_argument("--due", "-d", help="Due date (ISO 8601)")
@@ -333,102 +569,84 @@ def main():
     p.add_argument("--status", "-s", help="Status")
     p.add_argument("--description", help="Description")
     p.add_argument("--priority", choices=["asap", "high", "medium", "low"], help="Priority")
-    p.set_defaults(func=cmd_update)
-    
-    # complete
-    p = subparsers.add_parser("complete", help="Complete a task")
-    p.add_argument("task_id", help="Task ID")
-    p.set_defaults(func=cmd_complete)
-    
-    # delete
-    p = subparsers.add_parser("delete", help="Delete a task")
-    p.add_argument("task_id", help="Task ID")
-    p.set_defaults(func=cmd_delete)
-    
-    # move
-    p = subparsers.add_parser("move", help="Move a task")
+
+def _move_args(p):
     p.add_argument("task_id", help="Task ID")
     p.add_argument("--workspace", "-w", required=True, help="Target workspace ID")
     p.add_argument("--project", "-p", help="Target project ID")
-    p.set_defaults(func=cmd_move)
-    
-    # unassign
-    p = subparsers.add_parser("unassign", help="Unassign a task")
-    p.add_argument("task_id", help="Task ID")
-    p.set_defaults(func=cmd_unassign)
-    
-    # recurring
-    p = subparsers.add_parser("recurring", help="List recurring tasks")
-    p.add_argument("--workspace", "-w", help="Workspace ID")
-    p.set_defaults(func=cmd_recurring)
-    
-    # recurring-create
-    p = subparsers.add_parser("recurring-create", help="Create recurring task")
+
+def _recurring_create_args(p):
     p.add_argument("name", help="Task name")
     p.add_argument("--frequency", "-f", required=True, choices=["daily", "weekly", "monthly"], help="Frequency")
     p.add_argument("--days", help="Days of week (e.g., mon,tue,wed)")
     p.add_argument("--duration", help="Duration in minutes")
     p.add_argument("--project", "-p", help="Project ID")
     p.add_argument("--workspace", "-w", help="Workspace ID")
-    p.set_defaults(func=cmd_recurring_create)
-    
-    # recurring-delete
-    p = subparsers.add_parser("recurring-delete", help="Delete recurring task")
+
+def _recurring_delete_args(p):
     p.add_argument("task_id", help="Recurring task ID")
-    p.set_defaults(func=cmd_recurring_delete)
-    
-    # projects
-    p = subparsers.add_parser("projects", help="List projects")
-    p.add_argument("--workspace", "-w", help="Workspace ID")
-    p.set_defaults(func=cmd_projects)
-    
-    # project
-    p = subparsers.add_parser("project", help="Get a project")
+
+def _project_args(p):
     p.add_argument("project_id", help="Project ID")
-    p.set_defaults(func=cmd_project)
-    
-    # project-create
-    p = subparsers.add_parser("project-create", help="Create a project")
+
+def _project_create_args(p):
     p.add_argument("name", help="Project name")
     p.add_argument("--workspace", "-w", required=True, help="Workspace ID")
     p.add_argument("--description", help="Project description")
-    p.set_defaults(func=cmd_project_create)
-    
-    # workspaces
-    p = subparsers.add_parser("workspaces", help="List workspaces")
-    p.set_defaults(func=cmd_workspaces)
-    
-    # users
-    p = subparsers.add_parser("users", help="List users")
-    p.add_argument("--workspace", "-w", help="Workspace ID")
-    p.set_defaults(func=cmd_users)
-    
-    # me
-    p = subparsers.add_parser("me", help="Get current user")
-    p.set_defaults(func=cmd_me)
-    
-    # schedules
-    p = subparsers.add_parser("schedules", help="Get schedules")
-    p.add_argument("--workspace", "-w", help="Workspace ID")
-    p.set_defaults(func=cmd_schedules)
-    
-    # statuses
-    p = subparsers.add_parser("statuses", help="Get statuses")
+
+def _statuses_args(p):
     p.add_argument("--workspace", "-w", required=True, help="Workspace ID")
-    p.set_defaults(func=cmd_statuses)
-    
-    # comments
-    p = subparsers.add_parser("comments", help="Get comments on a task")
-    p.add_argument("task_id", help="Task ID")
-    p.set_defaults(func=cmd_comments)
-    
-    # comment
-    p = subparsers.add_parser("comment", help="Add a comment")
+
+def _batch_args(p):
+    p.add_argument("file", nargs="?", default="-", help="File of commands, one per line (default: stdin)")
+
+def _comment_args(p):
     p.add_argument("task_id", help="Task ID")
     p.add_argument("content", help="Comment text")
-    p.set_defaults(func=cmd_comment)
-    
-    args = parser.parse_args()
+
+# name -> (handler, help, argument builder)
+COMMANDS = {
+    "tasks": (cmd_tasks, "List tasks", _tasks_args),
+    "task": (cmd_task, "Get a task", _task_id_args),
+    "create": (cmd_create, "Create a task", _create_args),
+    "update": (cmd_update, "Update a task", _update_args),
+    "complete": (cmd_complete, "Complete a task", _task_id_args),
+    "delete": (cmd_delete, "Delete a task", _task_id_args),
+    "move": (cmd_move, "Move a task", _move_args),
+    "unassign": (cmd_unassign, "Unassign a task", _task_id_args),
+    "recurring": (cmd_recurring, "List recurring tasks", _workspace_args),
+    "recurring-create": (cmd_recurring_create, "Create recurring task", _recurring_create_args),
+    "recurring-delete": (cmd_recurring_delete, "Delete recurring task", _recurring_delete_args),
+    "projects": (cmd_projects, "List projects", _workspace_args),
+    "project": (cmd_project, "Get a project", _project_args),
+    "project-create": (cmd_project_create, "Create a project", _project_create_args),
+    "workspaces": (cmd_workspaces, "List workspaces", _no_args),
+    "users": (cmd_users, "List users", _workspace_args),
+    "me": (cmd_me, "Get current user", _no_args),
+    "schedules": (cmd_schedules, "Get schedules", _workspace_args),
+    "statuses": (cmd_statuses, "Get statuses", _statuses_args),
+    "comments": (cmd_comments, "Get comments on a task", _task_id_args),
+    "comment": (cmd_comment, "Add a comment", _comment_args),
+    "batch": (cmd_batch, "Run commands from a file or stdin", _batch_args),
+}
+
+def build_parser(command=None):
+    """Build the CLI parser. With `command`, only that subparser is built."""
+    parser = argparse.ArgumentParser(description="Motion API CLI")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (func, help_text, add_args) in COMMANDS.items():
+        if command and name != command:
+            continue
+        p = subparsers.add_parser(name, help=help_text)
+        add_args(p)
+        p.set_defaults(func=func)
+    return parser
+
+def main():
+    argv = sys.argv[1:]
+    # Skip building ~20 unused subparsers; -h and unknown commands get the full parser
+    command = argv[0] if argv and argv[0] in COMMANDS else None
+    args = build_parser(command).parse_args(argv)
     args.func(args)
 
 if __name__ == "__main__":
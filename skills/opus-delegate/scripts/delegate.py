@@ -17,18 +17,65 @@ Options:
 import argparse
 import os
 import pty
-import select
+import re
+import selectors
 import subprocess
 import sys
-import tempfile
 
+# Terminal noise stripped by clean_output(), matched on raw PTY bytes
+# One alternation so the regex engine sweeps the output once:
+# ANSI escape sequences | OSC sequences (like ]9;4;0;) | xterm title sequences
+TERMINAL_SEQ_RE = re.compile(
+    rb'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])'
+    rb'|\][\d;:]+'
+    rb'|\[\?[\d;]+[a-zA-Z]'
+)
+# Control characters except newline, deleted in one bytes.translate() pass
+CONTROL_CHARS = bytes(b for b in range(0x20) if b != 0x0a) + b'\x7f'
+# Per-line leftovers, matched after decoding
+TERMINAL_LINE_RE = re.compile(r'^[\d]+;[\d;:]*;?$')
+TRAILING_CODES_RE = re.compile(r'[\[\]]\d*;?\d*;?\d*$')
 
-def run_with_pty(cmd: list[str], timeout: int = 300) -> tuple[int, str]:
-    """Run command with a pseudo-terminal to satisfy TTY requirement."""
-    output = []
+# PTY read loop tuning
+READ_SIZE = 65536
+POLL_MIN = 0.01
+POLL_MAX = 0.1
+
+
+def _drain(fd: int, output: bytearray) -> int:
+    """Read everything currently buffered on a non-blocking fd.
+
+    Returns the number of bytes read, or -1 once the other end is closed.
+    """
+    total = 0
+    while True:
+        try:
+            data = os.read(fd, READ_SIZE)
+        except BlockingIOError:
+            return total
+        except OSError:
+            # Linux reports a closed PTY slave as EIO
+            return total or -1
+        if not data:
+            return total or -1
+        output += data
+        total += len(data)
+
+
+def run_with_pty(cmd: list[str], timeout: int = 300) -> tuple[int, bytes]:
+    """Run command with a pseudo-terminal to satisfy TTY requirement.
+
+    Output is returned as raw bytes; decode (or clean_output) it once at the
+    end so multi-byte characters split across reads survive intact.
+    """
+    output = bytearray()
     
     # Create pseudo-terminal
     master_fd, slave_fd = pty.openpty()
+    os.set_blocking(master_fd, False)
+    # Register once (epoll/kqueue) rather than rebuilding fd sets per select()
+    sel = selectors.DefaultSelector()
+    sel.register(master_fd, selectors.EVENT_READ)
     
     try:
         process = subprocess.Popen(
@@ -42,69 +89,79 @@ def run_with_pty(cmd: list[str], timeout: int = 300) -> tuple[int, str]:
         
         # Read output with timeout
         import time
-        start_time = time.time()
+        start_time = time.monotonic()
+        # Poll quickly while output is flowing, back off when idle
+        poll_interval = POLL_MIN
         
         while True:
-            if timeout and (time.time() - start_time) > timeout:
+            if timeout and (time.monotonic() - start_time) > timeout:
                 process.kill()
-                return 124, "".join(output) + "\nError: Timeout"
-            
-            # Check if process has finished
-            ret = process.poll()
+                return 124, bytes(output) + b"\nError: Timeout"
             
-            # Read available output
-            ready, _, _ = select.select([master_fd], [], [], 0.1)
-            if ready:
-                try:
-                    data = os.read(master_fd, 4096)
-                    if data:
-                        output.append(data.decode('utf-8', errors='replace'))
-                except OSError:
-                    pass
+            # Drain all available output
+            if sel.select(poll_interval):
+                n = _drain(master_fd, output)
+                if n < 0:
+                    # EOF/EIO: the child closed its end of the PTY
+                    break
+                if n:
+                    poll_interval = POLL_MIN
+                    continue
+            poll_interval = min(poll_interval * 2, POLL_MAX)
             
-            if ret is not None:
+            # Only check for exit while idle, in case a grandchild still holds
+            # the PTY open after the child itself has finished
+            if process.poll() is not None:
                 # Process finished, read any remaining output
-                while True:
-                    ready, _, _ = select.select([master_fd], [], [], 0.1)
-                    if not ready:
-                        break
-                    try:
-                        data = os.read(master_fd, 4096)
-                        if data:
-                            output.append(data.decode('utf-8', errors='replace'))
-                        else:
-                            break
-                    except OSError:
+                while sel.select(POLL_MAX):
+                    if _drain(master_fd, output) <= 0:
                         break
                 break
         
-        return process.returncode, "".join(output)
+        # Harvest the exit status, still bounded by the overall timeout
+        remaining = timeout - (time.monotonic() - start_time) if timeout else None
+        try:
+            process.wait(timeout=max(remaining, 0) if remaining is not None else None)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            return 124, bytes(output) + b"\nError: Timeout"
+        return process.returncode, bytes(output)
     
     finally:
+        sel.close()
         os.close(master_fd)
 
 
-def clean_output(text: str) -> str:
+def run_with_pipe(cmd: list[str], timeout: int = 300) -> tuple[int, bytes]:
+    """Run command with stdout on a plain pipe (no TTY, no terminal codes)."""
+    try:
+        result = subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            timeout=timeout or None,
+        )
+    except subprocess.TimeoutExpired as e:
+        print("Error: Timeout", file=sys.stderr)
+        return 124, e.output or b""
+    return result.returncode, result.stdout
+
+
+def clean_output(data: bytes) -> str:
     """Remove ANSI escape codes and control characters from output."""
-    import re
-    # Remove ANSI escape sequences
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    text = ansi_escape.sub('', text)
-    # Remove OSC sequences (like ]9;4;0; or various terminal codes)
-    text = re.sub(r'\][\d;:]+', '', text)
-    # Remove xterm title sequences and similar
-    text = re.sub(r'\[\?[\d;]+[a-zA-Z]', '', text)
+    # Remove ANSI escape, OSC, and xterm title sequences in one pass
+    data = TERMINAL_SEQ_RE.sub(b'', data)
     # Remove other control characters except newlines
-    text = re.sub(r'[\x00-\x09\x0b-\x1f\x7f]', '', text)
+    text = data.translate(None, CONTROL_CHARS).decode('utf-8', errors='replace')
     # Clean up any remaining garbage lines (terminal control sequences)
     lines = text.split('\n')
     cleaned_lines = []
     for line in lines:
         # Skip lines that look like terminal control sequences (must have semicolon)
-        if re.match(r'^[\d]+;[\d;:]*;?$', line.strip()):
+        if TERMINAL_LINE_RE.match(line.strip()):
             continue
         # Remove trailing terminal codes
-        line = re.sub(r'[\[\]]\d*;?\d*;?\d*$', '', line)
+        line = TRAILING_CODES_RE.sub('', line)
         if line.strip():
             cleaned_lines.append(line)
     return '\n'.join(cleaned_lines).strip()
@@ -132,6 +189,7 @@ def main():
         workdir = args.workdir
         cleanup_workdir = False
     else:
+        import tempfile
         workdir = tempfile.mkdtemp()
         cleanup_workdir = True
     
@@ -161,6 +219,15 @@ def main():
     os.chdir(workdir)
     
     try:
+        if args.json:
+            # --print --output-format json needs no TTY and emits no terminal
+            # codes, so skip the PTY and clean_output and pass the JSON through
+            exit_code, output = run_with_pipe(cmd, args.timeout)
+            output = output.strip()
+            if output:
+                sys.stdout.buffer.write(output + b'\n')
+            return exit_code
+        
         exit_code, output = run_with_pty(cmd, args.timeout)
         
         # Clean and print output
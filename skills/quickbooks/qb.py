@@ -4,6 +4,8 @@
 # dependencies = [
 #     "python-quickbooks",
 #     "intuit-oauth",
+#     "orjson",
+#     "python-gnupg",
 # ]
 # ///
 """
@@ -13,11 +15,15 @@ Run with: uv run qb.py <command>
 """
 
 import argparse
+import functools
 import json
 import os
+import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import parse_qs, urlparse
 
 from intuitlib.client import AuthClient
 from intuitlib.enums import Scopes
@@ -25,23 +31,175 @@ from quickbooks import QuickBooks
 from quickbooks.objects.customer import Customer
 from quickbooks.objects.invoice import Invoice
 from quickbooks.objects.account import Account
+from quickbooks.objects.base import QuickbooksBaseObject
 from quickbooks.objects.item import Item
 from quickbooks.objects.vendor import Vendor
 from quickbooks.objects.bill import Bill
 from quickbooks.objects.payment import Payment
 from quickbooks.objects.estimate import Estimate
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback when run outside uv
+    orjson = None
+
+try:
+    import gnupg
+except ImportError:  # decrypt through the pass CLI instead
+    gnupg = None
+
+# JSON goes straight to the byte stream, skipping print()'s re-encode
+_OUT = sys.stdout.buffer
+
+
+def _dumps(obj) -> bytes:
+    """Serialize obj to indented JSON bytes"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str)
+    return json.dumps(obj, indent=2, default=str).encode()
+
+
+def _emit(obj):
+    """Print obj as indented JSON"""
+    _OUT.write(_dumps(obj))
+    _OUT.write(b"\n")
+
+
+def _dump_record(obj, indent: bool = True) -> bytes:
+    """Serialize a QuickBooks object to (by default indented) JSON bytes.
+
+    With orjson the object is encoded directly: orjson walks it in C and
+    calls _orjson_default only for SDK objects, so no converted dict tree
+    is built first.
+    """
+    if orjson:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option, default=_orjson_default)
+    if indent:
+        return _dumps(to_dict(obj))
+    return json.dumps(to_dict(obj), default=str).encode()
+
+
+def _emit_record(obj):
+    """Print a QuickBooks object as indented JSON"""
+    _OUT.write(_dump_record(obj))
+    _OUT.write(b"\n")
+
+
+def _write_array(items, indent: bytes = b""):
+    """Stream QuickBooks objects as an indented JSON array, one record at a time"""
+    newline = b"\n" + indent
+    first = sep = b"[" + newline + b"  "
+    for item in items:
+        _OUT.write(sep)
+        # Nest the record one level; raw newlines only occur as indentation
+        _OUT.write(_dump_record(item).replace(b"\n", newline + b"  "))
+        sep = b"," + newline + b"  "
+    _OUT.write(b"[]" if sep is first else newline + b"]")
+
+
+def _emit_array(items):
+    """Print QuickBooks objects as an indented JSON array"""
+    _write_array(items)
+    _OUT.write(b"\n")
+
+
+# Records between flushes in NDJSON mode, so consumers see output as pages arrive
+NDJSON_FLUSH_EVERY = 100
+
+
+def _emit_ndjson(items):
+    """Print QuickBooks objects as NDJSON, one compact record per line"""
+    for count, item in enumerate(items, 1):
+        _OUT.write(_dump_record(item, indent=False))
+        _OUT.write(b"\n")
+        if count % NDJSON_FLUSH_EVERY == 0:
+            _OUT.flush()
+
+
+def _emit_list(items, ndjson: bool):
+    """Print a listing as a JSON array, or as NDJSON when requested"""
+    if ndjson:
+        _emit_ndjson(items)
+    else:
+        _emit_array(items)
+
+
+PASSWORD_STORE = Path(os.environ.get("PASSWORD_STORE_DIR", Path.home() / ".password-store"))
+
+# Values read from pass (or the environment) during this invocation
+_pass_cache: dict[str, str] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _gpg():
+    """Shared python-gnupg handle (construction probes the gpg binary)"""
+    return gnupg.GPG()
+
+
+def _decrypt_pass(key: str) -> str | None:
+    """Decrypt a pass entry directly with gpg, skipping the pass script; None means use pass"""
+    try:
+        with open(PASSWORD_STORE / "quickbooks" / f"{key}.gpg", "rb") as f:
+            result = _gpg().decrypt_file(f)
+    except FileNotFoundError:
+        return ""  # pass would fail the same way
+    except (OSError, ValueError):
+        return None
+    return str(result).strip() if result.ok else None
+
+
+def _read_pass(keys: list[str]) -> dict[str, str]:
+    """Read several entries, from QB_<KEY> if set, else from pass concurrently"""
+    values = {}
+    for key in keys:
+        env_value = os.environ.get(f"QB_{key.upper()}")
+        if env_value:
+            values[key] = env_value
+    keys = [k for k in keys if k not in values]
+    if not keys:
+        return values
+    
+    decrypted = {}
+    if gnupg:
+        with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+            decrypted = dict(zip(keys, executor.map(_decrypt_pass, keys)))
+    
+    procs = {}
+    for key in keys:
+        if decrypted.get(key) is not None:
+            continue
+        try:
+            procs[key] = subprocess.Popen(
+                ["pass", f"quickbooks/{key}"],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            pass
+    for key in keys:
+        value = decrypted.get(key) or ""
+        proc = procs.get(key)
+        if proc:
+            stdout, _ = proc.communicate()
+            if proc.returncode == 0:
+                value = stdout.decode("utf-8", "replace").strip()
+        values[key] = value
+    return values
+
+
+def get_passes(*keys: str) -> list[str]:
+    """Get values from pass password store, at most one lookup per key per process"""
+    missing = [k for k in keys if k not in _pass_cache]
+    if missing:
+        _pass_cache.update(_read_pass(missing))
+    return [_pass_cache[k] for k in keys]
+
 
 def get_pass(key: str) -> str:
     """Get value from pass password store"""
-    try:
-        result = subprocess.run(["pass", f"quickbooks/{key}"], capture_output=True, text=True)
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except:
-        pass
-    # Fallback to environment
-    return os.environ.get(f"QB_{key.upper()}", "")
+    return get_passes(key)[0]
 
 
 def save_pass(key: str, value: str):
@@ -55,16 +213,17 @@ def save_pass(key: str, value: str):
             text=True
         )
         proc.communicate(input=f"{value}\n{value}\n")
+        _pass_cache[key] = value
     except Exception as e:
         print(f"Warning: Could not save to pass: {e}", file=sys.stderr)
 
 
+@functools.lru_cache(maxsize=1)
 def get_client() -> QuickBooks:
-    """Initialize QuickBooks client with stored credentials"""
-    client_id = get_pass("client_id")
-    client_secret = get_pass("client_secret")
-    refresh_token = get_pass("refresh_token")
-    company_id = get_pass("company_id")
+    """Initialize QuickBooks client with stored credentials (once per process)"""
+    client_id, client_secret, refresh_token, company_id = get_passes(
+        "client_id", "client_secret", "refresh_token", "company_id"
+    )
     environment = os.environ.get("QB_ENVIRONMENT", "sandbox")
     
     if not all([client_id, client_secret, refresh_token, company_id]):
@@ -96,87 +255,241 @@ def get_client() -> QuickBooks:
     return client
 
 
+# How _convert() handles each value type, decided once per type. Field names
+# can't be cached: from_json sets whatever keys the API returned per instance.
+_SCALAR, _MAPPING, _SEQUENCE, _OBJECT, _AST = range(5)
+_KINDS: dict[type, int] = {
+    str: _SCALAR, int: _SCALAR, float: _SCALAR, bool: _SCALAR, type(None): _SCALAR,
+    dict: _MAPPING, list: _SEQUENCE,
+}
+
+
+def _classify(value) -> int:
+    """Pick the conversion for a new type, in the same order as the SDK's to_dict()"""
+    if isinstance(value, dict):
+        kind = _MAPPING
+    elif hasattr(value, "_ast"):
+        kind = _AST
+    elif hasattr(value, "__iter__") and not isinstance(value, str):
+        kind = _SEQUENCE
+    elif hasattr(value, "__dict__"):
+        kind = _OBJECT
+    else:
+        kind = _SCALAR
+    _KINDS[type(value)] = kind
+    return kind
+
+
+def _convert(value):
+    """Same output as the SDK's recursive to_dict(), without re-probing every value"""
+    kind = _KINDS.get(type(value))
+    if kind is None:
+        kind = _classify(value)
+    if kind == _SCALAR:
+        return value
+    if kind == _OBJECT:
+        return {k: _convert(v) for k, v in value.__dict__.items()
+                if not k.startswith("_") and not callable(v)}
+    if kind == _SEQUENCE:
+        return [_convert(v) for v in value]
+    if kind == _MAPPING:
+        return {k: _convert(v) for k, v in value.items()}
+    return _convert(value._ast())
+
+
+def _orjson_default(value):
+    """orjson hook: one level of what _convert() produces; orjson recurses"""
+    kind = _KINDS.get(type(value))
+    if kind is None:
+        kind = _classify(value)
+    if kind == _OBJECT:
+        return {k: v for k, v in value.__dict__.items()
+                if not k.startswith("_") and not callable(v)}
+    if kind == _SEQUENCE:
+        return list(value)
+    if kind == _MAPPING:
+        return dict(value)
+    if kind == _AST:
+        return value._ast()
+    # Anything else orjson can't encode natively (e.g. Decimal), like default=str
+    return str(value)
+
+
 def to_dict(obj):
     """Convert QuickBooks object to dict for JSON output"""
-    if hasattr(obj, 'to_dict'):
+    if isinstance(obj, QuickbooksBaseObject):
+        return _convert(obj)
+    elif hasattr(obj, 'to_dict'):
         return obj.to_dict()
     elif hasattr(obj, '__dict__'):
         return {k: v for k, v in obj.__dict__.items() if not k.startswith('_')}
     return str(obj)
 
 
+# QBO's maximum MAXRESULTS; keeps one page of objects in memory at a time
+PAGE_SIZE = 1000
+
+
+def _quote(value: str) -> str:
+    """Quote a string literal for a QBO query, escaping quotes as the SDK does"""
+    escaped = value.replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+def _iter_all(obj_cls, client: QuickBooks, limit: int | None = None, where: str | None = None):
+    """Yield up to `limit` objects of a type (matching `where`), one page at a time"""
+    name = obj_cls.qbo_object_name
+    # Item needs Sku requested explicitly, as in the SDK's all()
+    select = f"SELECT *, Sku FROM {name}" if name == "Item" else f"SELECT * FROM {name}"
+    if where:
+        select = f"{select} WHERE {where}"
+    position = 1  # STARTPOSITION is 1-based
+    while limit is None or position <= limit:
+        size = PAGE_SIZE if limit is None else min(PAGE_SIZE, limit - position + 1)
+        page = obj_cls.query(f"{select} STARTPOSITION {position} MAXRESULTS {size}", qb=client)
+        yield from page
+        if len(page) < size:
+            return
+        position += size
+
+
 def cmd_customers(args):
     """List or search customers"""
     client = get_client()
-    if args.search:
-        customers = Customer.filter(DisplayName=f"%{args.search}%", qb=client)
-    else:
-        customers = Customer.all(max_results=args.limit, qb=client)
-    
-    result = [to_dict(c) for c in customers]
-    print(json.dumps(result, indent=2, default=str))
+    where = f"DisplayName LIKE {_quote(f'%{args.search}%')}" if args.search else None
+    customers = _iter_all(Customer, client, args.limit, where)
+    _emit_list(customers, args.ndjson)
 
 
 def cmd_customer(args):
     """Get specific customer by ID"""
     client = get_client()
     customer = Customer.get(args.id, qb=client)
-    print(json.dumps(to_dict(customer), indent=2, default=str))
+    _emit_record(customer)
 
 
 def cmd_invoices(args):
     """List invoices"""
     client = get_client()
-    if args.customer:
-        invoices = Invoice.filter(CustomerRef=args.customer, qb=client)
-    else:
-        invoices = Invoice.all(max_results=args.limit, qb=client)
-    
-    result = [to_dict(i) for i in invoices]
-    print(json.dumps(result, indent=2, default=str))
+    where = f"CustomerRef = {_quote(args.customer)}" if args.customer else None
+    invoices = _iter_all(Invoice, client, args.limit, where)
+    _emit_list(invoices, args.ndjson)
 
 
 def cmd_invoice(args):
     """Get specific invoice by ID"""
     client = get_client()
     invoice = Invoice.get(args.id, qb=client)
-    print(json.dumps(to_dict(invoice), indent=2, default=str))
+    _emit_record(invoice)
 
 
 def cmd_accounts(args):
     """List accounts (chart of accounts)"""
     client = get_client()
-    if args.type:
-        accounts = Account.filter(AccountType=args.type, qb=client)
-    else:
-        accounts = Account.all(max_results=args.limit, qb=client)
-    
-    result = [to_dict(a) for a in accounts]
-    print(json.dumps(result, indent=2, default=str))
+    where = f"AccountType = {_quote(args.type)}" if args.type else None
+    accounts = _iter_all(Account, client, args.limit, where)
+    _emit_list(accounts, args.ndjson)
 
 
 def cmd_vendors(args):
     """List vendors"""
     client = get_client()
-    vendors = Vendor.all(max_results=args.limit, qb=client)
-    result = [to_dict(v) for v in vendors]
-    print(json.dumps(result, indent=2, default=str))
+    vendors = _iter_all(Vendor, client, args.limit)
+    _emit_list(vendors, args.ndjson)
 
 
 def cmd_items(args):
     """List items (products/services)"""
     client = get_client()
-    items = Item.all(max_results=args.limit, qb=client)
-    result = [to_dict(i) for i in items]
-    print(json.dumps(result, indent=2, default=str))
+    items = _iter_all(Item, client, args.limit)
+    _emit_list(items, args.ndjson)
 
 
 def cmd_query(args):
     """Run raw query"""
     client = get_client()
-    from quickbooks.objects.base import QuickbooksBaseObject
     result = QuickbooksBaseObject.query(args.query, qb=client)
-    print(json.dumps([to_dict(r) for r in result], indent=2, default=str))
+    _emit_list(result, args.ndjson)
+
+
+# What `dump` snapshots, as top-level keys in output order
+DUMP_ENTITIES = [
+    ("customers", Customer),
+    ("invoices", Invoice),
+    ("accounts", Account),
+    ("vendors", Vendor),
+    ("items", Item),
+]
+
+
+def cmd_dump(args):
+    """Dump every entity type as one JSON object, fetching them concurrently"""
+    client = get_client()
+    with ThreadPoolExecutor(max_workers=len(DUMP_ENTITIES)) as executor:
+        futures = [
+            (name, executor.submit(lambda cls: list(_iter_all(cls, client, args.limit)), cls))
+            for name, cls in DUMP_ENTITIES
+        ]
+        # Write each entity as soon as it (and those before it) have arrived
+        sep = b"{\n  "
+        for name, future in futures:
+            _OUT.write(sep + _dumps(name) + b": ")
+            _write_array(future.result(), indent=b"  ")
+            sep = b",\n  "
+        _OUT.write(b"\n}\n")
+
+
+# QBO's limit on operations per /batch request
+BATCH_SIZE = 30
+
+
+def _parse_op(spec: str) -> tuple[str, str]:
+    """Split an 'Entity:Id' batch op"""
+    entity, sep, obj_id = spec.partition(":")
+    if not sep or not entity.isalpha() or not obj_id.isdigit():
+        print(f"Error: invalid op '{spec}' (expected Entity:Id, e.g. Customer:123)", file=sys.stderr)
+        sys.exit(1)
+    return entity, obj_id
+
+
+def cmd_batch(args):
+    """Fetch several objects by ID with one /batch request per 30 ops"""
+    ops = [_parse_op(spec) for spec in args.op]
+    client = get_client()
+    
+    results = []
+    failed = False
+    for start in range(0, len(ops), BATCH_SIZE):
+        chunk = ops[start:start + BATCH_SIZE]
+        request = {"BatchItemRequest": [
+            {
+                "bId": str(i),
+                "operation": "query",
+                "Query": f"SELECT * FROM {entity} WHERE Id = '{obj_id}'",
+            }
+            for i, (entity, obj_id) in enumerate(chunk)
+        ]}
+        response = client.batch_operation(_dumps(request).decode())
+        items = {item["bId"]: item for item in response.get("BatchItemResponse", [])}
+        
+        for i, (entity, obj_id) in enumerate(chunk):
+            item = items.get(str(i), {})
+            result = {"op": f"{entity}:{obj_id}"}
+            if "Fault" in item:
+                result["Fault"] = item["Fault"]
+                failed = True
+            else:
+                found = item.get("QueryResponse", {}).get(entity, [])
+                result[entity] = found[0] if found else None
+            results.append(result)
+    
+    _emit(results)
+    if failed:
+        sys.exit(1)
+
+
+# OAuth scopes requested by `auth`
+_AUTH_SCOPES = [Scopes.ACCOUNTING]
 
 
 def cmd_auth(args):
@@ -191,8 +504,7 @@ def cmd_auth(args):
         redirect_uri="http://localhost:8000/callback",
     )
     
-    scopes = [Scopes.ACCOUNTING]
-    auth_url = auth_client.get_authorization_url(scopes)
+    auth_url = auth_client.get_authorization_url(_AUTH_SCOPES)
     
     print(f"\n1. Open this URL in your browser:\n{auth_url}\n")
     print("2. Log in and authorize the app")
@@ -201,7 +513,6 @@ def cmd_auth(args):
     callback_url = input("\n4. Paste the full callback URL here: ")
     
     # Parse the callback
-    from urllib.parse import urlparse, parse_qs
     parsed = urlparse(callback_url)
     params = parse_qs(parsed.query)
     
@@ -229,6 +540,17 @@ def cmd_auth(args):
     print("\n✓ Credentials saved to pass store")
 
 
+# An amount: 100, 100.50, -25, .5; a quantity is the same without the sign
+_QTY = r"(?:\d+(?:\.\d*)?|\.\d+)"
+_AMOUNT = rf"-?{_QTY}"
+# --line grammar, matched in one pass. ItemRef:Qty:UnitPrice is tried first so
+# "5:2:10" and "Svc:1.5:2" stay item lines; a description may itself contain colons.
+_LINE_RE = re.compile(
+    rf"(?P<ref>[^:]+):(?P<qty>{_QTY}):(?P<price>{_AMOUNT})"
+    rf"|(?P<desc>.+):(?P<amt>{_AMOUNT})"
+)
+
+
 def cmd_create_invoice(args):
     """Create a new invoice"""
     client = get_client()
@@ -244,29 +566,34 @@ def cmd_create_invoice(args):
     # Parse line items: "Description:Amount" or "ItemRef:Qty:UnitPrice"
     invoice.Line = []
     for line_str in args.line:
+        m = _LINE_RE.fullmatch(line_str)
+        if not m:
+            print(f"Error: invalid line '{line_str}' (expected 'Description:Amount' or 'ItemRef:Qty:UnitPrice')",
+                  file=sys.stderr)
+            sys.exit(1)
+        
         line = SalesItemLine()
         line.DetailType = "SalesItemLineDetail"
-        line.SalesItemLineDetail = SalesItemLineDetail()
+        line.SalesItemLineDetail = detail = SalesItemLineDetail()
         
-        parts = line_str.split(":")
-        if len(parts) == 2:
+        if m["ref"] is None:
             # Simple: Description:Amount
-            line.Description = parts[0]
-            line.Amount = float(parts[1])
-            line.SalesItemLineDetail.Qty = 1
-            line.SalesItemLineDetail.UnitPrice = float(parts[1])
-        elif len(parts) >= 3:
+            line.Description = m["desc"]
+            line.Amount = detail.UnitPrice = float(m["amt"])
+            detail.Qty = 1
+        else:
             # Item ref: ItemRef:Qty:UnitPrice
-            line.SalesItemLineDetail.ItemRef = Ref()
-            line.SalesItemLineDetail.ItemRef.value = parts[0]
-            line.SalesItemLineDetail.Qty = int(parts[1])
-            line.SalesItemLineDetail.UnitPrice = float(parts[2])
-            line.Amount = line.SalesItemLineDetail.Qty * line.SalesItemLineDetail.UnitPrice
+            detail.ItemRef = Ref()
+            detail.ItemRef.value = m["ref"]
+            qty = float(m["qty"])
+            detail.Qty = int(qty) if qty.is_integer() else qty
+            detail.UnitPrice = float(m["price"])
+            line.Amount = detail.Qty * detail.UnitPrice
         
         invoice.Line.append(line)
     
     invoice.save(qb=client)
-    print(json.dumps(to_dict(invoice), indent=2, default=str))
+    _emit_record(invoice)
 
 
 def main():
@@ -277,6 +604,7 @@ def main():
     p = subparsers.add_parser("customers", help="List customers")
     p.add_argument("--search", "-s", help="Search by display name")
     p.add_argument("--limit", "-l", type=int, default=100, help="Max results")
+    p.add_argument("--ndjson", action="store_true", help="Output one JSON record per line")
     p.set_defaults(func=cmd_customers)
     
     p = subparsers.add_parser("customer", help="Get customer by ID")
@@ -287,6 +615,7 @@ def main():
     p = subparsers.add_parser("invoices", help="List invoices")
     p.add_argument("--customer", "-c", help="Filter by customer ID")
     p.add_argument("--limit", "-l", type=int, default=100, help="Max results")
+    p.add_argument("--ndjson", action="store_true", help="Output one JSON record per line")
     p.set_defaults(func=cmd_invoices)
     
     p = subparsers.add_parser("invoice", help="Get invoice by ID")
@@ -303,23 +632,38 @@ def main():
     p = subparsers.add_parser("accounts", help="List accounts")
     p.add_argument("--type", "-t", help="Filter by account type")
     p.add_argument("--limit", "-l", type=int, default=100, help="Max results")
+    p.add_argument("--ndjson", action="store_true", help="Output one JSON record per line")
     p.set_defaults(func=cmd_accounts)
     
     # Vendors
     p = subparsers.add_parser("vendors", help="List vendors")
     p.add_argument("--limit", "-l", type=int, default=100, help="Max results")
+    p.add_argument("--ndjson", action="store_true", help="Output one JSON record per line")
     p.set_defaults(func=cmd_vendors)
     
     # Items
     p = subparsers.add_parser("items", help="List items")
     p.add_argument("--limit", "-l", type=int, default=100, help="Max results")
+    p.add_argument("--ndjson", action="store_true", help="Output one JSON record per line")
     p.set_defaults(func=cmd_items)
     
     # Query
     p = subparsers.add_parser("query", help="Run raw query")
     p.add_argument("query", help="Query string (e.g., 'SELECT * FROM Customer')")
+    p.add_argument("--ndjson", action="store_true", help="Output one JSON record per line")
     p.set_defaults(func=cmd_query)
     
+    # Dump
+    p = subparsers.add_parser("dump", help="Dump customers, invoices, accounts, vendors, and items")
+    p.add_argument("--limit", "-l", type=int, help="Max results per entity (default: all)")
+    p.set_defaults(func=cmd_dump)
+    
+    # Batch
+    p = subparsers.add_parser("batch", help="Fetch several objects by ID in one request")
+    p.add_argument("--op", "-o", action="append", required=True,
+                   help="Object to fetch: 'Entity:Id' (e.g. Customer:123); repeatable")
+    p.set_defaults(func=cmd_batch)
+    
     # Auth
     p = subparsers.add_parser("auth", help="OAuth flow to get tokens")
     p.add_argument("--client-id", help="Client ID")
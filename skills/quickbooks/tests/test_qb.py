@@ -0,0 +1,39 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "qb.py"
+_spec = importlib.util.spec_from_file_location("qb", SCRIPT)
+qb = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(qb)
+
+
+def create_invoice(monkeypatch, *lines):
+    """Run create-invoice without QuickBooks and return the lines it would save."""
+    from quickbooks.objects.invoice import Invoice
+    saved = []
+    monkeypatch.setattr(qb, "get_client", lambda: None)
+    monkeypatch.setattr(Invoice, "save", lambda self, qb=None: saved.append(self))
+    monkeypatch.setattr(qb, "_emit_record", lambda obj: None)
+    monkeypatch.setattr(sys, "argv", ["qb", "create-invoice", "--customer", "1",
+                                      *(arg for line in lines for arg in ("--line", line))])
+    qb.main()
+    return saved[0].Line
+
+
+def test_fractional_quantity_is_an_item_line(monkeypatch):
+    (line,) = create_invoice(monkeypatch, "Svc:1.5:2")
+    detail = line.SalesItemLineDetail
+    assert detail.ItemRef.value == "Svc"
+    assert detail.Qty == 1.5
+    assert detail.UnitPrice == 2.0
+    assert line.Amount == 3.0
+
+
+def test_description_and_whole_quantity_lines(monkeypatch):
+    desc, item = create_invoice(monkeypatch, "Setup: on site:100.50", "5:2:10")
+    assert desc.Description == "Setup: on site"
+    assert desc.Amount == 100.5
+    assert item.SalesItemLineDetail.ItemRef.value == "5"
+    assert item.SalesItemLineDetail.Qty == 2
+    assert item.Amount == 20.0
@@ -10,14 +10,69 @@ import json
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from urllib.parse import urlencode
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback keeps orjson optional
+    orjson = None
 
 CONFIG_PATH = Path.home() / ".config" / "skyswitch" / "config.json"
 TOKEN_CACHE_PATH = Path.home() / ".config" / "skyswitch" / "token.json"
 API_BASE = "https://api.skyswitch.com"
+# (connect, read) seconds; a stalled connection fails instead of hanging
+REQUEST_TIMEOUT = (3.05, 30)
+
+# Shared across calls for HTTP keep-alive; see _session()
+_SESSION = None
+# Last token loaded or fetched, so api_request doesn't re-read the cache file
+_TOKEN_MEM = None
+# JSON goes straight to the byte stream, skipping print()'s re-encode
+_OUT = sys.stdout.buffer
+
+
+def _loads(raw: bytes):
+    """Parse a JSON response body."""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def _emit(obj):
+    """Print obj as indented JSON."""
+    if orjson:
+        _OUT.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str))
+    else:
+        _OUT.write(json.dumps(obj, indent=2, default=str).encode())
+    _OUT.write(b"\n")
+
+
+def _emit_ndjson(items: list):
+    """Print each item as one line of compact JSON."""
+    for item in items:
+        if orjson:
+            _OUT.write(orjson.dumps(item, default=str))
+        else:
+            _OUT.write(json.dumps(item, default=str).encode())
+        _OUT.write(b"\n")
+
+
+def _session() -> requests.Session:
+    """Get the shared HTTP session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=(429, 502, 503, 504),
+            raise_on_status=False,  # hand the final response to our own error handling
+        )
+        _SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry))
+    return _SESSION
 
 
 def load_config() -> dict:
@@ -32,28 +87,42 @@ def load_config() -> dict:
 
 
 def save_token(token_data: dict):
-    """Cache the access token."""
+    """Cache the access token (atomically, owner-only from the start)."""
+    global _TOKEN_MEM
     TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
     token_data["cached_at"] = time.time()
-    with open(TOKEN_CACHE_PATH, "w") as f:
-        json.dump(token_data, f)
-    os.chmod(TOKEN_CACHE_PATH, 0o600)
+    payload = orjson.dumps(token_data) if orjson else json.dumps(token_data).encode()
+    tmp_path = TOKEN_CACHE_PATH.with_suffix(".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, TOKEN_CACHE_PATH)
+    _TOKEN_MEM = token_data
+
+
+def _token_valid(data: dict) -> bool:
+    """Check if token is unexpired (with 5 min buffer)."""
+    cached_at = data.get("cached_at", 0)
+    expires_in = data.get("expires_in", 0)
+    return time.time() <= cached_at + expires_in - 300
 
 
 def load_cached_token() -> dict | None:
-    """Load cached token if valid."""
-    if not TOKEN_CACHE_PATH.exists():
+    """Load cached token if valid, reading the cache file at most once."""
+    global _TOKEN_MEM
+    if _TOKEN_MEM is not None and _token_valid(_TOKEN_MEM):
+        return _TOKEN_MEM
+    
+    try:
+        with open(TOKEN_CACHE_PATH) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
         return None
     
-    with open(TOKEN_CACHE_PATH) as f:
-        data = json.load(f)
-    
-    # Check if token is expired (with 5 min buffer)
-    cached_at = data.get("cached_at", 0)
-    expires_in = data.get("expires_in", 0)
-    if time.time() > cached_at + expires_in - 300:
+    if not _token_valid(data):
         return None
     
+    _TOKEN_MEM = data
     return data
 
 
@@ -65,7 +134,7 @@ def get_access_token(config: dict, force_refresh: bool = False) -> str:
             return cached["access_token"]
     
     # Request new token
-    response = requests.post(
+    response = _session().post(
         f"{API_BASE}/oauth/token",
         data={
             "grant_type": "password",
@@ -75,6 +144,8 @@ def get_access_token(config: dict, force_refresh: bool = False) -> str:
             "password": config["password"],
             "scope": "pbx account",
         },
+        headers={"Authorization": None},  # don't send a stale bearer
+        timeout=REQUEST_TIMEOUT,
     )
     
     if response.status_code != 200:
@@ -82,28 +153,30 @@ def get_access_token(config: dict, force_refresh: bool = False) -> str:
         print(response.text, file=sys.stderr)
         sys.exit(1)
     
-    token_data = response.json()
+    token_data = _loads(response.content)
     save_token(token_data)
     return token_data["access_token"]
 
 
-def api_request(method: str, endpoint: str, config: dict, params: dict = None, retry: bool = True) -> dict:
-    """Make an authenticated API request."""
-    token = get_access_token(config)
+def send_request(method: str, endpoint: str, config: dict, params: dict = None, retry: bool = True) -> requests.Response:
+    """Send an authenticated API request and return the raw response."""
+    session = _session()
+    session.headers["Authorization"] = f"Bearer {get_access_token(config)}"
     
     url = f"{API_BASE}{endpoint}"
-    if params:
-        url = f"{url}?{urlencode(params)}"
-    
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    response = requests.request(method, url, headers=headers)
+    response = session.request(method, url, params=params, timeout=REQUEST_TIMEOUT)
     
     # Handle 401 by refreshing token
     if response.status_code == 401 and retry:
-        token = get_access_token(config, force_refresh=True)
-        headers = {"Authorization": f"Bearer {token}"}
-        response = requests.request(method, url, headers=headers)
+        session.headers["Authorization"] = f"Bearer {get_access_token(config, force_refresh=True)}"
+        response = session.request(method, url, params=params, timeout=REQUEST_TIMEOUT)
+    
+    return response
+
+
+def api_request(method: str, endpoint: str, config: dict, params: dict = None, retry: bool = True) -> dict:
+    """Make an authenticated API request."""
+    response = send_request(method, endpoint, config, params, retry)
     
     if response.status_code not in (200, 201, 204):
         print(f"API Error: {response.status_code}", file=sys.stderr)
@@ -113,7 +186,7 @@ def api_request(method: str, endpoint: str, config: dict, params: dict = None, r
     if response.status_code == 204:
         return {}
     
-    return response.json() if response.text else {}
+    return _loads(response.content) if response.content else {}
 
 
 def cmd_token(args, config: dict):
@@ -140,7 +213,7 @@ def cmd_domains(args, config: dict):
     result = api_request("GET", f"/accounts/{account_id}/pbx/domains", config)
     
     if args.json:
-        print(json.dumps(result, indent=2))
+        _emit(result)
     else:
         domains = result.get("data", result) if isinstance(result, dict) else result
         if isinstance(domains, list):
@@ -150,7 +223,7 @@ def cmd_domains(args, config: dict):
                 else:
                     print(d)
         else:
-            print(json.dumps(result, indent=2))
+            _emit(result)
 
 
 def cmd_vip_list(args, config: dict):
@@ -169,11 +242,13 @@ def cmd_vip_list(args, config: dict):
         params["dnis"] = args.dnis
     
     result = api_request("GET", f"/accounts/{account_id}/pbx/route-by-ani", config, params)
+    routes = result.get("data", result) if isinstance(result, dict) else result
     
-    if args.json:
-        print(json.dumps(result, indent=2))
+    if args.ndjson:
+        _emit_ndjson(routes if isinstance(routes, list) else [routes])
+    elif args.json:
+        _emit(result)
     else:
-        routes = result.get("data", result) if isinstance(result, dict) else result
         if isinstance(routes, list):
             if not routes:
                 print("No VIP routes found")
@@ -192,7 +267,7 @@ def cmd_vip_list(args, config: dict):
                     line += f" @ {domain}"
                 print(line)
         else:
-            print(json.dumps(result, indent=2))
+            _emit(result)
 
 
 def cmd_vip_add(args, config: dict):
@@ -219,11 +294,82 @@ def cmd_vip_add(args, config: dict):
     result = api_request("PUT", f"/accounts/{account_id}/pbx/route-by-ani", config, params)
     
     if args.json:
-        print(json.dumps(result, indent=2))
+        _emit(result)
     else:
         print(f"✓ Added VIP route: {args.ani} -> {args.destination}")
 
 
+def cmd_vip_bulk_add(args, config: dict):
+    """Add many VIP routes from newline-delimited JSON, several requests at a time."""
+    account_id = args.account or config.get("default_account_id")
+    if not account_id:
+        print("Error: No account ID provided and no default set", file=sys.stderr)
+        sys.exit(1)
+    
+    # Validate every line before sending anything
+    routes = []
+    try:
+        source = sys.stdin if args.file == "-" else open(args.file)
+    except OSError as e:
+        print(f"Error: cannot read {args.file}: {e.strerror}", file=sys.stderr)
+        sys.exit(1)
+    with source:
+        for lineno, line in enumerate(source, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                route = json.loads(line)
+            except ValueError as e:
+                print(f"Error: line {lineno}: invalid JSON ({e})", file=sys.stderr)
+                sys.exit(1)
+            if not isinstance(route, dict):
+                print(f"Error: line {lineno}: expected a JSON object", file=sys.stderr)
+                sys.exit(1)
+            params = {
+                "ani": route.get("ani"),
+                "domain": route.get("domain") or args.domain,
+                "destination": route.get("destination"),
+            }
+            if not all(params.values()):
+                print(f"Error: line {lineno}: ani, domain, and destination are required", file=sys.stderr)
+                sys.exit(1)
+            if route.get("dnis"):
+                params["dnis"] = route["dnis"]
+            params["application"] = route.get("application") or args.application
+            routes.append(params)
+    
+    endpoint = f"/accounts/{account_id}/pbx/route-by-ani"
+    
+    def add(params: dict) -> dict:
+        try:
+            response = send_request("PUT", endpoint, config, params)
+        except requests.RequestException as e:
+            return {**params, "status": None, "error": str(e)}
+        result = {**params, "status": response.status_code}
+        if response.status_code not in (200, 201, 204):
+            result["error"] = response.text
+        return result
+    
+    # Fetch/refresh the token once up front so workers don't race to refresh it
+    get_access_token(config)
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(add, routes))
+    
+    failed = [r for r in results if "error" in r]
+    if args.json:
+        _emit(results)
+    else:
+        for r in results:
+            if "error" in r:
+                print(f"✗ {r['ani']}: API Error {r['status']}: {r['error']}", file=sys.stderr)
+            else:
+                print(f"✓ Added VIP route: {r['ani']} -> {r['destination']}")
+        print(f"{len(results) - len(failed)}/{len(results)} routes added", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
 def cmd_vip_remove(args, config: dict):
     """Remove a VIP route."""
     account_id = args.account or config.get("default_account_id")
@@ -246,6 +392,17 @@ def cmd_vip_remove(args, config: dict):
     print(f"✓ Removed VIP route for {args.ani}")
 
 
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(description="SkySwitch Telco API CLI")
     parser.add_argument("--account", "-a", help="Account ID (overrides default)")
@@ -270,6 +427,7 @@ def main():
     vip_list.add_argument("--domain", "-d", help="Filter by domain")
     vip_list.add_argument("--ani", help="Filter by ANI")
     vip_list.add_argument("--dnis", help="Filter by DNIS")
+    vip_list.add_argument("--ndjson", action="store_true", help="Output one JSON route per line")
     
     # vip add
     vip_add = vip_subparsers.add_parser("add", help="Add VIP route")
@@ -280,6 +438,14 @@ def main():
     vip_add.add_argument("--application", choices=["user", "device", "literal"], 
                          default="user", help="Destination type")
     
+    # vip bulk-add
+    vip_bulk_add = vip_subparsers.add_parser("bulk-add", help="Add VIP routes from a JSONL file")
+    vip_bulk_add.add_argument("--file", "-f", default="-", help="JSONL file of routes (default: stdin)")
+    vip_bulk_add.add_argument("--domain", "-d", help="Default PBX domain for lines without one")
+    vip_bulk_add.add_argument("--application", choices=["user", "device", "literal"],
+                              default="user", help="Default destination type")
+    vip_bulk_add.add_argument("--concurrency", "-c", type=_positive_int, default=8, help="Parallel requests")
+    
     # vip remove
     vip_remove = vip_subparsers.add_parser("remove", help="Remove VIP route")
     vip_remove.add_argument("--ani", required=True, help="Caller ANI")
@@ -306,6 +472,8 @@ def main():
             cmd_vip_list(args, config)
         elif args.vip_command == "add":
             cmd_vip_add(args, config)
+        elif args.vip_command == "bulk-add":
+            cmd_vip_bulk_add(args, config)
         elif args.vip_command == "remove":
             cmd_vip_remove(args, config)
 
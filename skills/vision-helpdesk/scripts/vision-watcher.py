@@ -7,26 +7,89 @@ Usage:
     
 Environment:
     VISION_WATCHER_WEBHOOK - Discord/Slack webhook URL for alerts
-    VISION_WATCHER_STATE   - Path to state file (default: ~/.vision-watcher-state.json)
+    VISION_WATCHER_STATE   - Path to state file (default: ~/.vision-watcher-state.json);
+                             changes between snapshots are journaled next to it in <state file>.journal
 """
 
 import argparse
+import asyncio
+import functools
+import hashlib
+import html
 import json
 import os
+import re
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import ijson
+except ImportError:  # parse whole responses instead of streaming them
+    ijson = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # strip tags with regexes instead
+    HTMLParser = None
+
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json for API responses and webhook payloads
+    orjson = None
 
 DEFAULT_STATE_FILE = os.path.expanduser("~/.vision-watcher-state.json")
 DEFAULT_LOOKBACK_HOURS = 2
+DEFAULT_RETENTION_DAYS = 30
+TICKET_PAGE_LIMIT = 100  # get_tickets page size (vis_limit)
+HIGH_WATER_OVERLAP = 60  # Seconds re-checked below the last modify_date, for clock skew
+DEFAULT_TRIAGE_CACHE_FILE = os.path.expanduser("~/.vision-watcher-triage-cache.json")
+TRIAGE_CACHE_DAYS = 14
+TRIAGE_CONCURRENCY = 5  # Tickets triaged at once (Vision API + Claude CLI)
+CLAUDE_TIMEOUT = 60
+SLACK_POST_URL = "https://slack.com/api/chat.postMessage"
+DISCORD_MAX_EMBEDS = 10  # Per webhook message
+DISCORD_MAX_CHARS = 6000  # Embed text (titles, descriptions, fields, footers) per message
+DISCORD_DESCRIPTION_CHARS = 1000  # Per embed, so several long summaries share a message
+SLACK_MAX_TICKETS = 12  # 4 blocks each, under Slack's 50-block message limit
+JSON_HEADERS = {"Content-Type": "application/json"}
 
+PRIORITY_EMOJI = {"Urgent": "🔴", "High": "🟠", "Medium": "🟡", "Low": "🟢"}
+PRIORITY_COLOR = {"Urgent": 0xff0000, "High": 0xff8800, "Medium": 0xffcc00, "Low": 0x00cc00}
 
+# Shared across calls for HTTP keep-alive; see _session()
+_SESSION = None
+
+
+def _session() -> requests.Session:
+    """Return the process-wide HTTP session (Vision API, Discord, Slack)."""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+        # Retries idempotent requests only; webhook POSTs are sent once
+        retry = Retry(
+            total=5,
+            backoff_factor=2,
+            status_forcelist=(429, 500, 502, 503, 529),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry)
+        _SESSION.mount("https://", adapter)
+        _SESSION.mount("http://", adapter)
+    return _SESSION
+
+
+@functools.lru_cache(maxsize=4)
 def get_credentials(profile: str = "20859") -> dict:
-    """Load credentials from pass."""
+    """Load credentials from pass (once per profile per run)."""
     paths_to_try = [
         f"vision/{profile}",
         f"{profile}/visionhelpdesk/env"
@@ -59,37 +122,149 @@ def get_credentials(profile: str = "20859") -> dict:
     raise RuntimeError(f"Could not load credentials for profile {profile}")
 
 
-def api_request(operation: str, params: dict, profile: str = "20859") -> dict:
-    """Make an API request to Vision Helpdesk."""
-    creds = get_credentials(profile)
-    
-    request_params = {
+def _request_params(creds: dict, operation: str, params: dict) -> dict:
+    """Query parameters common to every Vision Helpdesk API call."""
+    return {
         "vis_txttoken": creds["token"],
         "vis_module": "ticket",
         "vis_operation": operation,
         "vis_encode": "json",
         **params
     }
+
+
+def _json_loads(raw: bytes):
+    """Parse a JSON response body (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def api_request(operation: str, params: dict, profile: str = "20859") -> dict:
+    """Make an API request to Vision Helpdesk."""
+    creds = get_credentials(profile)
+    request_params = _request_params(creds, operation, params)
     
-    response = requests.get(creds["url"], params=request_params, timeout=30)
+    response = _session().get(creds["url"], params=request_params, timeout=30)
     response.raise_for_status()
-    return response.json()
+    return _json_loads(response.content)
+
+
+def stream_tickets(operation: str, params: dict, profile: str = "20859"):
+    """
+    Yield the tickets in a response's "data" array one at a time.
+    With ijson each ticket is parsed as it arrives instead of after the whole body.
+    """
+    if ijson is None:
+        yield from api_request(operation, params, profile).get("data", [])
+        return
+    
+    creds = get_credentials(profile)
+    request_params = _request_params(creds, operation, params)
+    
+    with _session().get(creds["url"], params=request_params, timeout=30, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True  # let urllib3 undo gzip
+        yield from ijson.items(response.raw, "data.item", use_float=True)
+
+
+def _compact_json(obj) -> str:
+    """Serialize without whitespace; state files are only read by this script."""
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _journal_path(state_file: str) -> Path:
+    """Append-only log of state changes made since the last snapshot."""
+    # Appended rather than with_suffix(), which would return the state file itself for *.log
+    state_file = Path(state_file)
+    return state_file.with_name(state_file.name + ".journal")
 
 
 def load_state(state_file: str) -> dict:
-    """Load watcher state from file."""
+    """Load watcher state: the snapshot file, then any journaled changes."""
+    state = {"seen_tickets": {}, "last_check": None}
     path = Path(state_file)
     if path.exists():
         try:
-            return json.loads(path.read_text())
+            state = json.loads(path.read_text())
         except (json.JSONDecodeError, IOError):
             pass
-    return {"seen_tickets": {}, "last_check": None}
+    
+    try:
+        with open(_journal_path(state_file)) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn final line from an interrupted run
+                ticket_id = record.pop("id", None)
+                if ticket_id is not None:
+                    state.setdefault("seen_tickets", {})[ticket_id] = record
+                else:
+                    state.update(record)
+    except IOError:
+        pass
+    return state
+
+
+def _atomic_write(path: str, text: str) -> None:
+    """Write a file via temp file + fsync + rename, so readers never see a partial one."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _write_snapshot(state: dict, state_file: str) -> None:
+    """Atomically replace the state snapshot and clear the journal."""
+    _atomic_write(state_file, _compact_json(state))
+    # Replaying a stale journal over the new snapshot is harmless, so order is safe
+    _journal_path(state_file).unlink(missing_ok=True)
+
+
+def save_state(state: dict, state_file: str, changed: Optional[list] = None) -> None:
+    """
+    Save watcher state to file.
+    With `changed` ticket IDs, append just those entries to the journal and only
+    rewrite the snapshot once the journal outgrows it.
+    """
+    if changed is None:
+        _write_snapshot(state, state_file)
+        return
+    
+    seen = state["seen_tickets"]
+    lines = [_compact_json({"id": ticket_id, **seen[ticket_id]}) for ticket_id in changed]
+    lines.append(_compact_json({k: v for k, v in state.items() if k != "seen_tickets"}))
+    data = ("\n".join(lines) + "\n").encode()
+    journal = _journal_path(state_file)
+    with open(journal, "ab+") as f:
+        # Start on a fresh line if an interrupted run left a partial record
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                data = b"\n" + data
+        f.write(data)
+    
+    snapshot_size = os.path.getsize(state_file) if os.path.exists(state_file) else 0
+    if journal.stat().st_size > 2 * snapshot_size:
+        _write_snapshot(state, state_file)
+
+
+def load_triage_cache(cache_file: str) -> dict:
+    """Load cached Claude triage summaries, dropping expired ones."""
+    try:
+        cache = json.loads(Path(cache_file).read_text())
+    except (json.JSONDecodeError, IOError):
+        return {}
+    cutoff = time.time() - TRIAGE_CACHE_DAYS * 86400
+    return {k: v for k, v in cache.items() if v.get("cached_at", 0) >= cutoff}
 
 
-def save_state(state: dict, state_file: str) -> None:
-    """Save watcher state to file."""
-    Path(state_file).write_text(json.dumps(state, indent=2))
+def save_triage_cache(cache: dict, cache_file: str) -> None:
+    """Save cached Claude triage summaries."""
+    _atomic_write(cache_file, _compact_json(cache))
 
 
 def format_timestamp(ts: str) -> str:
@@ -101,10 +276,20 @@ def format_timestamp(ts: str) -> str:
         return str(ts)
 
 
-def send_discord_alert(webhook_url: str, title: str, tickets: list, color: int = 0x00ff00) -> None:
+def _json_body(payload) -> bytes:
+    """Serialize a webhook payload or --json output to compact UTF-8 JSON (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def send_discord_alert(
+    webhook_url: str, title: str, tickets: list, color: int = 0x00ff00, now: Optional[datetime] = None
+) -> None:
     """Send alert to Discord webhook."""
     if not tickets:
         return
+    now = now or datetime.now()
     
     # Build embed fields for each ticket
     fields = []
@@ -117,7 +302,7 @@ def send_discord_alert(webhook_url: str, title: str, tickets: list, color: int =
         modified = format_timestamp(t.get("modify_date", ""))
         
         # Color code by priority
-        priority_emoji = {"Urgent": "🔴", "High": "🟠", "Medium": "🟡", "Low": "🟢"}.get(priority, "⚪")
+        priority_emoji = PRIORITY_EMOJI.get(priority, "⚪")
         
         fields.append({
             "name": f"{priority_emoji} {ticket_hash} — {status}",
@@ -129,7 +314,7 @@ def send_discord_alert(webhook_url: str, title: str, tickets: list, color: int =
         "title": title,
         "color": color,
         "fields": fields,
-        "footer": {"text": f"Vision Helpdesk • {datetime.now().strftime('%Y-%m-%d %H:%M')}"}
+        "footer": {"text": f"Vision Helpdesk • {now.strftime('%Y-%m-%d %H:%M')}"}
     }
     
     if len(tickets) > 10:
@@ -138,7 +323,7 @@ def send_discord_alert(webhook_url: str, title: str, tickets: list, color: int =
     payload = {"embeds": [embed]}
     
     try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = _session().post(webhook_url, data=_json_body(payload), headers=JSON_HEADERS, timeout=10)
         response.raise_for_status()
     except requests.RequestException as e:
         print(f"Failed to send Discord alert: {e}", file=sys.stderr)
@@ -154,8 +339,165 @@ def get_ticket_details(ticket_id: str, profile: str = "20859") -> dict:
         return {}
 
 
-def triage_with_claude(ticket: dict, ticket_details: dict) -> str:
-    """Call Claude CLI to generate triage summary."""
+# HTML stripping for ticket bodies (regex fallback without selectolax)
+_RE_HTML = re.compile(r'<[^>]+>')
+_RE_WS = re.compile(r'\s+')
+
+
+# Where the customer's own text ends in a raw (unflattened) body. Reply headers and
+# quoted-reply containers always end it; line patterns may be wrapped in tags
+# (<div>On ... wrote:<br></div>).
+_RE_QUOTED_HTML = re.compile(r'<blockquote\b|<div\b[^>]*\b(?:gmail_quote|yahoo_quoted|divRplyFwdMsg)', re.IGNORECASE)
+_LINE_START = r'^(?:[ \t]|<[^>\n]*>)*'
+_RE_REPLY_HEADER = re.compile(
+    _LINE_START + r'(?:'
+    r'On\s[^\n]{1,200}\bwrote:(?:[ \t]|<[^>\n]*>)*$'
+    r'|-{2,}\s*Original Message\s*-{2,}'
+    r'|From:\s[^\n]*\n' + _LINE_START + r'(?:Sent|Date):'
+    r')',
+    re.MULTILINE
+)
+# Weaker markers, only trusted with what follows them: sign-offs need a short tail
+_RE_SIGN_OFF = re.compile(
+    r'(?:Thanks|Thank you|Regards|Best regards|Kind regards|Cheers|Sent from my \w+)[ \t,.!]*$',
+    re.IGNORECASE
+)
+SIGNATURE_MAX_LINES = 4  # Lines allowed after a sign-off
+SIGNATURE_MAX_CHARS = 40  # Length of each of those lines
+MIN_STRIPPED_CHARS = 40  # Keep the whole body rather than send less text than this
+
+
+def _line_text(line: str) -> str:
+    """One raw body line as plain text."""
+    return html.unescape(_RE_HTML.sub('', line)).strip()
+
+
+def _soft_quote_cut(content: str) -> Optional[int]:
+    """
+    Offset of a trailing signature or quote block: a "-- " separator line, a sign-off
+    followed by only a few short lines, or "> " lines running to the end. None if
+    there is none. A block introduced by a colon ("the error says:") is content.
+    """
+    lines = content.splitlines(keepends=True)
+    texts = [_line_text(line) for line in lines]
+    offsets = []
+    pos = 0
+    for line in lines:
+        offsets.append(pos)
+        pos += len(line)
+    
+    def introduced(i):
+        before = [t for t in texts[:i] if t]
+        return bool(before) and before[-1].endswith(":")
+    
+    # Trailing "> " block (blank lines may separate its quotes)
+    i = len(lines)
+    while i and (not texts[i - 1] or texts[i - 1].startswith(">")):
+        i -= 1
+    while i < len(lines) and not texts[i]:
+        i += 1
+    if i < len(lines) and not introduced(i):
+        return offsets[i]
+    
+    for i, text in enumerate(texts):
+        # Standard signature separator: exactly "-- " (not a bare "--")
+        if _RE_HTML.sub('', lines[i]).rstrip("\r\n") == "-- " and not introduced(i):
+            return offsets[i]
+        if _RE_SIGN_OFF.fullmatch(text) and not introduced(i):
+            tail = [t for t in texts[i + 1:] if t]
+            if len(tail) <= SIGNATURE_MAX_LINES and all(len(t) <= SIGNATURE_MAX_CHARS for t in tail):
+                return offsets[i]
+    return None
+
+
+def _strip_quoted(content: str) -> str:
+    """
+    Cut a raw ticket body at the first quoted reply or signature. Runs before
+    _html_to_text, while line breaks and quote markup still exist. The body is kept
+    whole if less than MIN_STRIPPED_CHARS of text would remain.
+    """
+    cuts = [m.start() for m in (_RE_QUOTED_HTML.search(content), _RE_REPLY_HEADER.search(content)) if m]
+    soft = _soft_quote_cut(content)
+    if soft is not None:
+        cuts.append(soft)
+    if cuts:
+        head = content[:min(cuts)]
+        if len(_html_to_text(head)) >= MIN_STRIPPED_CHARS:
+            return head
+    return content
+
+
+def _html_to_text(content: str) -> str:
+    """Flatten ticket HTML to single-spaced plain text with entities decoded."""
+    if not content:
+        return ""
+    if HTMLParser is not None:
+        return " ".join(HTMLParser(content).text(separator=" ").split())
+    text = html.unescape(_RE_HTML.sub(' ', content))
+    return _RE_WS.sub(' ', text).strip()
+
+# Keyword signals for generate_fallback_triage, matched as lowercase substrings
+_SPAM_SIGNALS = ("unsubscribe", "click here", "act now", "limited time", "invoice attached",
+                 "get funds", "eligible invoices", "marketing", "newsletter")
+_AUTO_REPLY_SIGNALS = ("automatic reply", "auto-reply", "autoreply", "i am currently out", "i will be out of the office",
+                       "i'm currently out", "thank you for your email", "i will respond when i return")
+_REQUEST_SIGNALS = ("please", "need", "want", "can you", "could you", "forward", "change", "update")
+_BILLING_SIGNALS = ("invoice", "payment", "billing", "charge", "receipt", "account balance")
+_URGENT_SIGNALS = ("down", "not working", "emergency", "urgent", "asap", "can't make calls", "no dial tone")
+_ROUTING_SIGNALS = ("forward", "routing", "route", "transfer", "redirect")
+_VOICEMAIL_SIGNALS = ("voicemail", "vm", "greeting", "message")
+_HARDWARE_SIGNALS = ("phone", "handset", "device", "hardware")
+# Strong auto-reply markers, enough on their own to skip Claude (see _non_actionable_triage)
+_AUTO_REPLY_SUBJECTS = ("automatic reply:", "auto-reply:", "autoreply:", "auto reply:", "out of office:",
+                        "undeliverable:", "delivery status notification")
+_AUTO_SENDER_PATTERNS = ("mailer-daemon@", "postmaster@")
+
+_SPAM_TRIAGE = "**Summary:** Likely spam or marketing email\n**Category:** spam\n**Urgency:** ⚪ None\n**Action:** Ignore - spam/marketing"
+_AUTO_REPLY_TRIAGE = "**Summary:** Auto-reply/OOO message\n**Category:** other\n**Urgency:** ⚪ None\n**Action:** Close - auto-reply"
+
+
+def _has_any(text: str, signals: tuple) -> bool:
+    """True if any signal occurs in text (substring search runs in C, stops at first hit)."""
+    return any(map(text.__contains__, signals))
+
+
+def _count_hits(text: str, signals: tuple) -> int:
+    """Number of distinct signals that occur in text."""
+    return sum(map(text.__contains__, signals))
+
+
+async def start_claude() -> Optional[asyncio.subprocess.Process]:
+    """
+    Start `claude --print` waiting for its prompt on stdin, or None if it can't run.
+    Starting it early lets CLI startup overlap with fetching the ticket.
+    """
+    try:
+        return await asyncio.create_subprocess_exec(
+            "claude", "--print",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+    except OSError:
+        return None
+
+
+async def _discard(proc: asyncio.subprocess.Process) -> None:
+    """Kill a Claude process whose answer is no longer wanted."""
+    # Close stdin first: a child still reading it would keep the pipes (and wait()) open
+    if proc.stdin is not None:
+        proc.stdin.close()
+    if proc.returncode is None:
+        proc.kill()
+    await proc.wait()
+
+
+async def triage_with_claude(
+    ticket: dict, ticket_details: dict, cache: Optional[dict] = None,
+    proc: Optional[asyncio.subprocess.Process] = None
+) -> str:
+    """
+    Call Claude CLI to generate triage summary, reusing `cache` for identical prompts.
+    `proc` is a process from start_claude() to send the prompt to; one is started if omitted.
+    """
     ticket_hash = ticket.get("ticket_hash", "?")
     subject = ticket.get("subject", "No subject")
     company = ticket.get("company_name", "Unknown") or "Unknown"
@@ -164,12 +506,17 @@ def triage_with_claude(ticket: dict, ticket_details: dict) -> str:
     
     # Extract content from details
     content = ticket_details.get("content", "") if ticket_details else ""
-    # Strip HTML for cleaner input
-    import re
-    content_text = re.sub(r'<[^>]+>', ' ', content)
-    content_text = re.sub(r'\s+', ' ', content_text).strip()[:2000]
+    # Strip HTML and quoted history for cleaner (and fewer) input tokens
+    content_text = _html_to_text(_strip_quoted(content))[:2000]
+    
+    # Unmistakable spam and auto-replies don't need Claude
+    canned = _non_actionable_triage(ticket, subject, content_text)
+    if canned:
+        if proc is not None:
+            await _discard(proc)
+        return canned
     
-    prompt = f"""Triage this support ticket. Even if you can't gather telecom context, ALWAYS provide a useful summary.
+    prompt = f"""Triage this support ticket. ALWAYS provide a useful summary, even without telecom context.
 
 Ticket: {ticket_hash}
 Subject: {subject}
@@ -187,72 +534,89 @@ Respond with this EXACT format (fill in the brackets):
 **Urgency:** [🔴 High - service down/urgent | 🟡 Medium - needs attention today | 🟢 Low - can wait | ⚪ None - spam/auto-reply]
 **Action:** [What should a tech do? Or "Ignore - spam" / "Close - auto-reply" if not actionable]
 
-Rules:
-- ALWAYS fill in all 4 fields, even for spam/junk tickets
-- If it's spam, marketing, or an auto-reply: Category=spam, Urgency=⚪ None, Action=Ignore
-- If it's billing/invoice related: Category=billing, suggest forwarding to accounting
-- Keep total response under 400 chars
-- No extra commentary"""
+Rules: fill in all 4 fields. Spam/auto-reply: Category=spam, Urgency=⚪ None, Action=Ignore.
+Billing: Category=billing, forward to accounting. Under 400 chars, no extra commentary."""
 
+    # Same prompt, same answer: skip Claude for tickets triaged before
+    cache_key = hashlib.sha256(prompt.encode()).hexdigest()
+    if cache is not None and cache_key in cache:
+        if proc is not None:
+            await _discard(proc)
+        return cache[cache_key]["summary"]
+    
     try:
-        result = subprocess.run(
-            ["claude", "--print", prompt],
-            capture_output=True, text=True, timeout=60
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            return result.stdout.strip()
+        # The prompt goes over stdin rather than argv (no ARG_MAX limit, not visible in ps)
+        proc = proc or await start_claude()
+        if proc is None:
+            return generate_fallback_triage(ticket, subject, content_text, reason="claude CLI unavailable")
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(prompt.encode()), timeout=CLAUDE_TIMEOUT)
+        except asyncio.TimeoutError:
+            await _discard(proc)
+            return generate_fallback_triage(ticket, subject, content_text, reason="timeout")
+        output = stdout.decode(errors="replace").strip()
+        if proc.returncode == 0 and output:
+            if cache is not None:
+                cache[cache_key] = {"summary": output, "cached_at": int(time.time())}
+            return output
         else:
             # Fallback: generate minimal triage without Claude
             return generate_fallback_triage(ticket, subject, content_text)
-    except subprocess.TimeoutExpired:
-        return generate_fallback_triage(ticket, subject, content_text, reason="timeout")
     except Exception as e:
         return generate_fallback_triage(ticket, subject, content_text, reason=str(e)[:50])
 
 
+def _non_actionable_triage(ticket: dict, subject: str, content: str) -> Optional[str]:
+    """
+    Canned triage for tickets that are clearly junk, so Claude needn't see them: an
+    auto-reply subject or bounce sender, or several spam/auto-reply signals with no
+    urgency or request wording. A single keyword hit is left for Claude to judge.
+    """
+    email = (ticket.get("email") or "").lower()
+    if subject.lower().startswith(_AUTO_REPLY_SUBJECTS) or _has_any(email, _AUTO_SENDER_PATTERNS):
+        return _AUTO_REPLY_TRIAGE
+    
+    combined = subject.lower() + " " + content.lower()[:500]
+    if _has_any(combined, _URGENT_SIGNALS) or _has_any(combined, _REQUEST_SIGNALS):
+        return None
+    if _count_hits(combined, _SPAM_SIGNALS) >= 2:
+        return _SPAM_TRIAGE
+    if _count_hits(combined, _AUTO_REPLY_SIGNALS) >= 2:
+        return _AUTO_REPLY_TRIAGE
+    return None
+
+
 def generate_fallback_triage(ticket: dict, subject: str, content: str, reason: str = "") -> str:
     """Generate a basic triage when Claude fails."""
-    import re
-    
     subject_lower = subject.lower()
     content_lower = content.lower()[:500]
     combined = subject_lower + " " + content_lower
     
     # Detect spam/marketing
-    spam_signals = ["unsubscribe", "click here", "act now", "limited time", "invoice attached", 
-                    "get funds", "eligible invoices", "marketing", "newsletter"]
-    if any(sig in combined for sig in spam_signals):
-        return "**Summary:** Likely spam or marketing email\n**Category:** spam\n**Urgency:** ⚪ None\n**Action:** Ignore - spam/marketing"
+    if _has_any(combined, _SPAM_SIGNALS):
+        return _SPAM_TRIAGE
     
     # Detect auto-replies (but not requests mentioning "out of office")
-    auto_signals = ["automatic reply", "auto-reply", "autoreply", "i am currently out", "i will be out of the office", 
-                    "i'm currently out", "thank you for your email", "i will respond when i return"]
     # Only match auto-reply if it looks like a bounce, not a request
-    request_signals = ["please", "need", "want", "can you", "could you", "forward", "change", "update"]
-    is_request = any(sig in combined for sig in request_signals)
-    if any(sig in combined for sig in auto_signals) and not is_request:
-        return "**Summary:** Auto-reply/OOO message\n**Category:** other\n**Urgency:** ⚪ None\n**Action:** Close - auto-reply"
+    if _has_any(combined, _AUTO_REPLY_SIGNALS) and not _has_any(combined, _REQUEST_SIGNALS):
+        return _AUTO_REPLY_TRIAGE
     
     # Detect billing
-    billing_signals = ["invoice", "payment", "billing", "charge", "receipt", "account balance"]
-    if any(sig in combined for sig in billing_signals):
+    if _has_any(combined, _BILLING_SIGNALS):
         return f"**Summary:** {subject[:60]}\n**Category:** billing\n**Urgency:** 🟢 Low\n**Action:** Forward to accounting"
     
-    # Detect urgent issues
-    urgent_signals = ["down", "not working", "emergency", "urgent", "asap", "can't make calls", "no dial tone"]
-    if any(sig in combined for sig in urgent_signals):
+    # Detect urgent issues; everything else needs attention today
+    if _has_any(combined, _URGENT_SIGNALS):
         urgency = "🔴 High"
-    elif any(sig in combined for sig in ["forwarding", "routing", "voicemail", "greeting"]):
-        urgency = "🟡 Medium"
     else:
         urgency = "🟡 Medium"
     
     # Detect category
-    if any(sig in combined for sig in ["forward", "routing", "route", "transfer", "redirect"]):
+    if _has_any(combined, _ROUTING_SIGNALS):
         category = "routing"
-    elif any(sig in combined for sig in ["voicemail", "vm", "greeting", "message"]):
+    elif _has_any(combined, _VOICEMAIL_SIGNALS):
         category = "voicemail"
-    elif any(sig in combined for sig in ["phone", "handset", "device", "hardware"]):
+    elif _has_any(combined, _HARDWARE_SIGNALS):
         category = "hardware"
     else:
         category = "other"
@@ -261,37 +625,75 @@ def generate_fallback_triage(ticket: dict, subject: str, content: str, reason: s
     return f"**Summary:** {subject[:60]}\n**Category:** {category}\n**Urgency:** {urgency}\n**Action:** Review ticket{reason_note}"
 
 
-def post_triage_to_discord(webhook_url: str, ticket: dict, triage_summary: str) -> None:
-    """Post triage summary to Discord webhook."""
+def _build_discord_embed(ticket: dict, triage_summary: str, clock: str) -> dict:
+    """Build the Discord embed for one triaged ticket."""
     ticket_hash = ticket.get("ticket_hash", "?")
     ticket_id = ticket.get("ticket_id", "")
     subject = ticket.get("subject", "No subject")[:80]
     priority = ticket.get("priority", "?")
-    company = ticket.get("company_name", "Unknown")
+    company = (ticket.get("company_name", "Unknown") or "Unknown")[:60]
     
     # Build ticket URL
     ticket_url = f"https://clients.sipcapturer.com/manage/#/ticket/ticket_details/{ticket_hash}/{ticket_id}"
     
-    priority_emoji = {"Urgent": "🔴", "High": "🟠", "Medium": "🟡", "Low": "🟢"}.get(priority, "⚪")
+    priority_emoji = PRIORITY_EMOJI.get(priority, "⚪")
     
-    embed = {
+    return {
         "title": f"{priority_emoji} {ticket_hash}: {subject}",
         "url": ticket_url,
-        "description": triage_summary[:2000],
-        "color": {"Urgent": 0xff0000, "High": 0xff8800, "Medium": 0xffcc00, "Low": 0x00cc00}.get(priority, 0x888888),
-        "footer": {"text": f"{company} • {datetime.now().strftime('%H:%M')}"}
+        "description": triage_summary[:DISCORD_DESCRIPTION_CHARS],
+        "color": PRIORITY_COLOR.get(priority, 0x888888),
+        "footer": {"text": f"{company} • {clock}"}
     }
-    
-    try:
-        response = requests.post(webhook_url, json={"embeds": [embed]}, timeout=10)
-        response.raise_for_status()
-        print(f"Posted triage for {ticket_hash}")
-    except requests.RequestException as e:
-        print(f"Discord post failed: {e}", file=sys.stderr)
 
 
-def post_triage_to_slack(channel: str, ticket: dict, triage_summary: str, bot_token: str) -> None:
-    """Post triage summary to Slack channel using Bot API."""
+def _embed_chars(embed: dict) -> int:
+    """Characters Discord counts against a message's embed total."""
+    return (
+        len(embed.get("title", "")) + len(embed.get("description", ""))
+        + len(embed.get("footer", {}).get("text", ""))
+        + sum(len(f.get("name", "")) + len(f.get("value", "")) for f in embed.get("fields", ()))
+    )
+
+
+def _discord_batches(items: list, clock: str) -> list:
+    """Group (ticket, embed) pairs into messages within Discord's embed count and size limits."""
+    batches = []
+    batch = []
+    used = 0
+    for ticket, summary in items:
+        embed = _build_discord_embed(ticket, summary, clock)
+        size = _embed_chars(embed)
+        if batch and (len(batch) == DISCORD_MAX_EMBEDS or used + size > DISCORD_MAX_CHARS):
+            batches.append(batch)
+            batch = []
+            used = 0
+        batch.append((ticket, embed))
+        used += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def post_batch_to_discord(webhook_url: str, items: list, now: Optional[datetime] = None) -> None:
+    """Post triage summaries to a Discord webhook, packing embeds into as few messages as fit."""
+    clock = (now or datetime.now()).strftime("%H:%M")
+    for batch in _discord_batches(items, clock):
+        embeds = [embed for _, embed in batch]
+        hashes = ", ".join(ticket.get("ticket_hash", "?") for ticket, _ in batch)
+        
+        try:
+            response = _session().post(
+                webhook_url, data=_json_body({"embeds": embeds}), headers=JSON_HEADERS, timeout=10
+            )
+            response.raise_for_status()
+            print(f"Posted triage for {hashes}")
+        except requests.RequestException as e:
+            print(f"Discord post failed: {e}", file=sys.stderr)
+
+
+def _build_slack_blocks(ticket: dict, triage_summary: str, clock: str) -> list:
+    """Build the Slack blocks for one triaged ticket (ending in a divider)."""
     ticket_hash = ticket.get("ticket_hash", "?")
     ticket_id = ticket.get("ticket_id", "")
     subject = ticket.get("subject", "No subject")[:80]
@@ -301,10 +703,9 @@ def post_triage_to_slack(channel: str, ticket: dict, triage_summary: str, bot_to
     # Build ticket URL
     ticket_url = f"https://clients.sipcapturer.com/manage/#/ticket/ticket_details/{ticket_hash}/{ticket_id}"
     
-    priority_emoji = {"Urgent": "🔴", "High": "🟠", "Medium": "🟡", "Low": "🟢"}.get(priority, "⚪")
+    priority_emoji = PRIORITY_EMOJI.get(priority, "⚪")
     
-    # Build Slack blocks
-    blocks = [
+    return [
         {
             "type": "header",
             "text": {
@@ -325,34 +726,63 @@ def post_triage_to_slack(channel: str, ticket: dict, triage_summary: str, bot_to
             "elements": [
                 {
                     "type": "mrkdwn",
-                    "text": f"*{company}* • {priority} • {datetime.now().strftime('%H:%M')} • <{ticket_url}|View Ticket>"
+                    "text": f"*{company}* • {priority} • {clock} • <{ticket_url}|View Ticket>"
                 }
             ]
         },
         {"type": "divider"}
     ]
-    
-    payload = {
-        "channel": channel,
-        "text": f"{priority_emoji} {ticket_hash}: {subject}",
-        "blocks": blocks,
-        "unfurl_links": False
-    }
-    
-    try:
-        response = requests.post(
-            "https://slack.com/api/chat.postMessage",
-            json=payload,
-            headers={"Authorization": f"Bearer {bot_token}", "Content-Type": "application/json"},
-            timeout=10
-        )
-        result = response.json()
-        if result.get("ok"):
-            print(f"Posted triage for {ticket_hash} to Slack #{channel}")
+
+
+def post_batch_to_slack(channel: str, items: list, bot_token: str, now: Optional[datetime] = None) -> None:
+    """Post triage summaries to a Slack channel using Bot API, one message per batch."""
+    clock = (now or datetime.now()).strftime("%H:%M")
+    for start in range(0, len(items), SLACK_MAX_TICKETS):
+        batch = items[start:start + SLACK_MAX_TICKETS]
+        blocks = [block for ticket, summary in batch for block in _build_slack_blocks(ticket, summary, clock)]
+        hashes = ", ".join(ticket.get("ticket_hash", "?") for ticket, _ in batch)
+        
+        if len(batch) == 1:
+            ticket = batch[0][0]
+            priority_emoji = PRIORITY_EMOJI.get(ticket.get("priority", "?"), "⚪")
+            text = f"{priority_emoji} {ticket.get('ticket_hash', '?')}: {ticket.get('subject', 'No subject')[:80]}"
         else:
-            print(f"Slack post failed: {result.get('error')}", file=sys.stderr)
-    except requests.RequestException as e:
-        print(f"Slack post failed: {e}", file=sys.stderr)
+            text = f"🎫 {len(batch)} tickets triaged: {hashes}"
+        
+        payload = {
+            "channel": channel,
+            "text": text,
+            "blocks": blocks,
+            "unfurl_links": False
+        }
+        
+        try:
+            response = _session().post(
+                SLACK_POST_URL,
+                data=_json_body(payload),
+                headers={"Authorization": f"Bearer {bot_token}", "Content-Type": "application/json"},
+                timeout=10
+            )
+            # Slack echoes the whole posted message back; success starts with "ok":true,
+            # so the body is only parsed when that prefix is missing
+            if response.ok and b'"ok":true' in response.content[:64]:
+                result = {"ok": True}
+            else:
+                result = _json_loads(response.content)
+            if result.get("ok"):
+                print(f"Posted triage for {hashes} to Slack #{channel}")
+            else:
+                print(f"Slack post failed: {result.get('error')}", file=sys.stderr)
+        except (requests.RequestException, ValueError) as e:
+            print(f"Slack post failed: {e}", file=sys.stderr)
+
+
+# Pre-triage filters for should_skip_ticket
+_SKIP_BILLING_KEYWORDS = ("invoice", "payment", "funding", "funds", "billing",
+                          "receipt", "statement", "balance due", "pay now",
+                          "eligible invoices", "get funds", "received your invoice")
+_SKIP_SENDER_PATTERNS = ("marketing", "newsletter", "promo", "noreply@")
+_SKIP_SYSTEM_KEYWORDS = ("automatic notification", "do not reply", "system alert")
 
 
 def should_skip_ticket(ticket: dict) -> tuple[bool, str]:
@@ -365,114 +795,213 @@ def should_skip_ticket(ticket: dict) -> tuple[bool, str]:
     email = (ticket.get("email") or "").lower()
     
     # Skip billing/funding/invoice tickets
-    billing_keywords = [
-        "invoice", "payment", "funding", "funds", "billing", 
-        "receipt", "statement", "balance due", "pay now",
-        "eligible invoices", "get funds", "received your invoice"
-    ]
-    if any(kw in subject for kw in billing_keywords):
+    if _has_any(subject, _SKIP_BILLING_KEYWORDS):
         return True, "billing/invoice"
     
     # Skip known spam/marketing senders
-    spam_domains = ["marketing", "newsletter", "promo", "noreply@"]
-    if any(sd in email for sd in spam_domains):
+    if _has_any(email, _SKIP_SENDER_PATTERNS):
         return True, "spam sender"
     
     # Skip auto-generated system emails
-    system_keywords = ["automatic notification", "do not reply", "system alert"]
-    if any(kw in subject for kw in system_keywords):
+    if _has_any(subject, _SKIP_SYSTEM_KEYWORDS):
         return True, "system notification"
     
     return False, ""
 
 
+async def _triage_one(ticket: dict, semaphore: asyncio.Semaphore, profile: str, cache: dict) -> str:
+    """Fetch details and triage one ticket; blocking HTTP runs in a worker thread."""
+    ticket_id = ticket.get("ticket_id")
+    ticket_hash = ticket.get("ticket_hash", "?")
+    
+    async with semaphore:
+        print(f"Triaging {ticket_hash}...")
+        
+        # get_tickets with vis_details_req=1 usually carries the body already;
+        # only fetch full details when it doesn't, with Claude starting up meanwhile
+        proc = None
+        if ticket.get("content"):
+            details = ticket
+        elif ticket_id:
+            proc = await start_claude()
+            try:
+                details = await asyncio.to_thread(get_ticket_details, ticket_id, profile)
+            except BaseException:
+                if proc is not None:
+                    await _discard(proc)
+                raise
+        else:
+            details = {}
+        
+        # Call Claude for triage
+        return await triage_with_claude(ticket, details, cache, proc)
+
+
+async def _triage_all(tickets: list, profile: str) -> list:
+    """Triage tickets concurrently; returns (ticket, summary) pairs in ticket order."""
+    semaphore = asyncio.Semaphore(TRIAGE_CONCURRENCY)
+    # Blocking HTTP (asyncio.to_thread) runs on a pool no bigger than the triage limit
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=TRIAGE_CONCURRENCY, thread_name_prefix="triage")
+    )
+    cache = load_triage_cache(DEFAULT_TRIAGE_CACHE_FILE)
+    cached = len(cache)
+    results = await asyncio.gather(
+        *(_triage_one(ticket, semaphore, profile, cache) for ticket in tickets),
+        return_exceptions=True
+    )
+    if len(cache) != cached:
+        try:
+            save_triage_cache(cache, DEFAULT_TRIAGE_CACHE_FILE)
+        except IOError as e:
+            print(f"Could not save triage cache: {e}", file=sys.stderr)
+    
+    triaged = []
+    for ticket, result in zip(tickets, results):
+        if isinstance(result, BaseException):
+            print(f"Triage failed for {ticket.get('ticket_hash', '?')}: {result}", file=sys.stderr)
+        else:
+            triaged.append((ticket, result))
+    return triaged
+
+
 def triage_tickets_immediately(
     tickets: list, 
     profile: str = "20859",
     slack_channel: Optional[str] = None,
     slack_token: Optional[str] = None,
-    discord_webhook: Optional[str] = None
+    discord_webhook: Optional[str] = None,
+    now: Optional[datetime] = None
 ) -> None:
-    """Triage tickets using Claude CLI and post to Slack/Discord immediately."""
-    triaged_count = 0
+    """Triage tickets using Claude CLI, then post all summaries to Slack/Discord at once."""
+    eligible = []
     
     for ticket in tickets[:10]:  # Check up to 10, but may skip some
-        if triaged_count >= 5:  # Limit actual triages to 5
+        if len(eligible) >= 5:  # Limit actual triages to 5
             break
-            
-        ticket_id = ticket.get("ticket_id")
-        ticket_hash = ticket.get("ticket_hash", "?")
         
         # Pre-filter: skip billing/spam/system tickets
         should_skip, skip_reason = should_skip_ticket(ticket)
         if should_skip:
-            print(f"Skipping {ticket_hash} ({skip_reason})")
+            print(f"Skipping {ticket.get('ticket_hash', '?')} ({skip_reason})")
             continue
         
-        print(f"Triaging {ticket_hash}...")
-        triaged_count += 1
-        
-        # Get full ticket details
-        details = get_ticket_details(ticket_id, profile) if ticket_id else {}
-        
-        # Call Claude for triage
-        summary = triage_with_claude(ticket, details)
-        
-        # Post to Slack or Discord
-        if slack_channel and slack_token:
-            post_triage_to_slack(slack_channel, ticket, summary, slack_token)
-        elif discord_webhook:
-            post_triage_to_discord(discord_webhook, ticket, summary)
-        else:
-            print(f"--- {ticket_hash} ---")
+        eligible.append(ticket)
+    
+    if not eligible:
+        return
+    
+    triaged = asyncio.run(_triage_all(eligible, profile))
+    if not triaged:
+        return
+    
+    # Post to Slack or Discord
+    if slack_channel and slack_token:
+        post_batch_to_slack(slack_channel, triaged, slack_token, now=now)
+    elif discord_webhook:
+        post_batch_to_discord(discord_webhook, triaged, now=now)
+    else:
+        for ticket, summary in triaged:
+            print(f"--- {ticket.get('ticket_hash', '?')} ---")
             print(summary)
             print()
 
 
-def check_tickets(profile: str, state: dict, lookback_hours: int = 2) -> tuple[list, list]:
+def check_tickets(
+    profile: str, state: dict, lookback_hours: int = 2, now: Optional[datetime] = None
+) -> tuple[list, list]:
     """
     Check for new and updated tickets.
     Returns (new_tickets, updated_tickets).
     """
-    since = int((datetime.now() - timedelta(hours=lookback_hours)).timestamp())
+    now = now or datetime.now()
+    now_ts = int(now.timestamp())
+    since = int((now - timedelta(hours=lookback_hours)).timestamp())
+    # Anything modified before the newest modify_date already processed was seen then
+    high_water = state.get("high_water_modify_date")
+    if high_water:
+        since = max(since, high_water - HIGH_WATER_OVERLAP)
     
     params = {
         "vis_filter": f"modify_date>{since}",
         "vis_details_req": 1,
         "vis_skip_info": 1,
-        "vis_limit": "0,100"
+        "vis_limit": f"0,{TICKET_PAGE_LIMIT}"
     }
     
-    result = api_request("get_tickets", params, profile)
-    tickets = result.get("data", [])
+    tickets = stream_tickets("get_tickets", params, profile)
     
     seen = state.get("seen_tickets", {})
     new_tickets = []
     updated_tickets = []
     
+    count = 0
+    newest = high_water or 0
+    
     for ticket in tickets:
+        count += 1
         ticket_id = str(ticket.get("ticket_id", ""))
         if not ticket_id:
             continue
         
         modify_time = ticket.get("modify_date", "")
+        try:
+            newest = max(newest, int(modify_time))
+        except (ValueError, TypeError):
+            pass
         
-        if ticket_id not in seen:
+        # One lookup per ticket; unchanged tickets (the usual case) allocate nothing
+        entry = seen.get(ticket_id)
+        if entry is None:
             # New ticket
             new_tickets.append(ticket)
-            seen[ticket_id] = {"modify_date": modify_time, "first_seen": datetime.now().isoformat()}
-        elif seen[ticket_id].get("modify_date") != modify_time:
+            seen[ticket_id] = {"modify_date": modify_time, "first_seen": now_ts}
+        elif entry.get("modify_date") != modify_time:
             # Updated ticket
             updated_tickets.append(ticket)
-            seen[ticket_id]["modify_date"] = modify_time
-            seen[ticket_id]["last_updated"] = datetime.now().isoformat()
+            entry["modify_date"] = modify_time
+            entry["last_updated"] = now_ts
     
     state["seen_tickets"] = seen
-    state["last_check"] = datetime.now().isoformat()
+    state["last_check"] = now.isoformat()
+    # A full page may have cut off older changes, so only advance past a complete one
+    if count < TICKET_PAGE_LIMIT and newest:
+        state["high_water_modify_date"] = newest
     
     return new_tickets, updated_tickets
 
 
+def _entry_time(value) -> Optional[float]:
+    """Unix time of a seen_tickets timestamp (ints, or ISO strings from older state files)."""
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (ValueError, TypeError):
+        return None
+
+
+def prune_seen(state: dict, retention_days: int, lookback_hours: int) -> int:
+    """
+    Drop seen tickets with no activity within the retention window.
+    Returns the number of entries removed.
+    """
+    # Never forget a ticket the next lookback could still return, or it would alert as new
+    window = max(retention_days * 86400, lookback_hours * 3600)
+    cutoff = time.time() - window
+    
+    seen = state.get("seen_tickets", {})
+    stale = []
+    for ticket_id, entry in seen.items():
+        times = [t for t in (_entry_time(entry.get("first_seen")), _entry_time(entry.get("last_updated"))) if t is not None]
+        if times and max(times) < cutoff:
+            stale.append(ticket_id)
+    
+    for ticket_id in stale:
+        del seen[ticket_id]
+    return len(stale)
+
+
 def filter_important(tickets: list) -> list:
     """Filter to only high/urgent priority tickets."""
     return [t for t in tickets if t.get("priority") in ("High", "Urgent")]
@@ -484,6 +1013,8 @@ def main():
     parser.add_argument("--state-file", default=DEFAULT_STATE_FILE, help="State file path")
     parser.add_argument("--webhook-url", help="Discord/Slack webhook URL")
     parser.add_argument("--hours", type=int, default=DEFAULT_LOOKBACK_HOURS, help="Hours to look back")
+    parser.add_argument("--state-retention-days", type=int, default=DEFAULT_RETENTION_DAYS,
+                        help="Forget tickets with no activity for this many days")
     parser.add_argument("--quiet", "-q", action="store_true", help="Only output on new tickets")
     parser.add_argument("--important-only", action="store_true", help="Only alert on high/urgent")
     parser.add_argument("--triage", action="store_true", help="Triage new tickets with Claude CLI")
@@ -493,6 +1024,9 @@ def main():
     
     args = parser.parse_args()
     
+    # One timestamp for the whole run, so state and every alert agree
+    now = datetime.now()
+    
     # Get webhook URL from args or environment
     webhook_url = args.webhook_url or os.environ.get("VISION_WATCHER_WEBHOOK")
     state_file = args.state_file or os.environ.get("VISION_WATCHER_STATE", DEFAULT_STATE_FILE)
@@ -501,30 +1035,38 @@ def main():
     state = load_state(state_file)
     
     try:
-        new_tickets, updated_tickets = check_tickets(args.profile, state, args.hours)
+        new_tickets, updated_tickets = check_tickets(args.profile, state, args.hours, now=now)
     except Exception as e:
         print(f"Error checking tickets: {e}", file=sys.stderr)
         sys.exit(1)
     
+    # Entries check_tickets added or changed, for the state journal; pruning
+    # removes entries, which needs a full snapshot
+    changed = [str(t["ticket_id"]) for t in new_tickets + updated_tickets]
+    if prune_seen(state, args.state_retention_days, args.hours):
+        changed = None
+    
     # Filter if requested
     if args.important_only:
         new_tickets = filter_important(new_tickets)
         updated_tickets = filter_important(updated_tickets)
     
     # Save state
-    save_state(state, state_file)
+    save_state(state, state_file, changed)
     
     # Output
     if args.json:
-        print(json.dumps({
+        # Compact UTF-8 straight to the byte stream; this is meant for piping
+        sys.stdout.buffer.write(_json_body({
             "new": new_tickets,
             "updated": updated_tickets,
-            "timestamp": datetime.now().isoformat()
-        }, indent=2))
+            "timestamp": now.isoformat()
+        }))
+        sys.stdout.buffer.write(b"\n")
         return
     
     if not args.quiet:
-        print(f"Checked at {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+        print(f"Checked at {now.strftime('%Y-%m-%d %H:%M')}")
         print(f"New tickets: {len(new_tickets)}")
         print(f"Updated tickets: {len(updated_tickets)}")
     
@@ -536,16 +1078,17 @@ def main():
             profile=args.profile,
             slack_channel=args.slack_channel,
             slack_token=slack_token,
-            discord_webhook=webhook_url
+            discord_webhook=webhook_url,
+            now=now
         )
     elif webhook_url:
         # Just send basic alerts if not triaging
         if new_tickets:
-            send_discord_alert(webhook_url, f"🎫 {len(new_tickets)} New Ticket(s)", new_tickets, color=0x00ff00)
+            send_discord_alert(webhook_url, f"🎫 {len(new_tickets)} New Ticket(s)", new_tickets, color=0x00ff00, now=now)
         if updated_tickets:
             important_updates = filter_important(updated_tickets)
             if important_updates:
-                send_discord_alert(webhook_url, f"🔄 {len(important_updates)} High-Priority Update(s)", important_updates, color=0xffaa00)
+                send_discord_alert(webhook_url, f"🔄 {len(important_updates)} High-Priority Update(s)", important_updates, color=0xffaa00, now=now)
     
     # Exit code indicates new tickets
     if new_tickets:
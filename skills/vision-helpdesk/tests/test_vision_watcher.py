@@ -0,0 +1,71 @@
+import importlib.util
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "vision-watcher.py"
+_spec = importlib.util.spec_from_file_location("vision_watcher", SCRIPT)
+vw = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(vw)
+
+
+def stripped(content):
+    return vw._html_to_text(vw._strip_quoted(content))
+
+
+def test_sign_off_followed_by_real_text_is_kept():
+    body = "Hi,\nThanks.\nOur phones are down since this morning, please help"
+    assert stripped(body) == "Hi, Thanks. Our phones are down since this morning, please help"
+
+
+def test_quoted_error_introduced_by_text_is_kept():
+    body = "Please see the error below\n> Error 503 from carrier: trunk down"
+    assert "Error 503 from carrier" in stripped(body)
+
+
+def test_bare_double_dash_is_not_a_signature():
+    body = "line one\n--\nline two of real content"
+    assert "line two of real content" in stripped(body)
+
+
+def test_signature_separator_after_colon_is_kept():
+    body = "The voicemail greeting says:\n-- \nWe are closed"
+    assert "We are closed" in stripped(body)
+
+
+def test_reply_history_and_signature_are_stripped():
+    text = "Line 3 is not forwarding to the cell phones anymore."
+    assert stripped(text + "\n\nOn Mon, Jan 5, 2026 at 9:00 AM Bob <b@x.com> wrote:\n> old") == text
+    assert stripped(text + "\n\nThanks,\nJane Doe\nAcme Corp 555-1234") == text
+    assert stripped(text + "\n-- \nJane Doe") == text
+
+
+class _Recorder:
+    """Stands in for the HTTP session; records each posted JSON body."""
+
+    def __init__(self):
+        self.bodies = []
+
+    def post(self, url, data=None, **kwargs):
+        self.bodies.append(vw.json.loads(data))
+        return self
+
+    def raise_for_status(self):
+        pass
+
+
+def test_discord_batches_stay_under_message_size(monkeypatch):
+    recorder = _Recorder()
+    monkeypatch.setattr(vw, "_session", lambda: recorder)
+    items = [
+        ({"ticket_id": str(i), "ticket_hash": f"T-{i}", "subject": "S" * 200,
+          "priority": "High", "company_name": "C" * 200}, "x" * 3000)
+        for i in range(10)
+    ]
+
+    vw.post_batch_to_discord("https://discord.invalid/webhook", items)
+
+    embeds = [embed for body in recorder.bodies for embed in body["embeds"]]
+    assert len(embeds) == 10
+    assert len(recorder.bodies) > 1
+    for body in recorder.bodies:
+        assert len(body["embeds"]) <= vw.DISCORD_MAX_EMBEDS
+        assert sum(map(vw._embed_chars, body["embeds"])) <= vw.DISCORD_MAX_CHARS